@@ -99,6 +99,43 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# Deployments running several processes should point this at a shared
+# backend such as django.core.cache.backends.redis.RedisCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Token lookups are cached per process for TOKEN_CACHE_LOCAL_TTL seconds,
+# which bounds how long other processes accept a deleted token, and for
+# TOKEN_CACHE_SHARED_TTL seconds in the cache above unless it is
+# process-local.
+
+TOKEN_CACHE_LOCAL_SIZE = int(os.environ.get('TOKEN_CACHE_LOCAL_SIZE', 1024))
+TOKEN_CACHE_LOCAL_TTL = int(os.environ.get('TOKEN_CACHE_LOCAL_TTL', 10))
+TOKEN_CACHE_SHARED_TTL = int(os.environ.get('TOKEN_CACHE_SHARED_TTL', 300))
+
+# API list responses are cached per user for API_CACHE_TTL seconds, or
+# until any of the user's shopping data changes. They are keyed by the
+# user's latest change in the database, so they stay current in every
+# process whether or not the cache is shared.
+
+API_CACHE_TTL = int(os.environ.get('API_CACHE_TTL', 300))
+
+# Rendered fragments of the site's list, item and tag pages are cached
+# per user for FRAGMENT_CACHE_TTL seconds, or until their data changes.
+
+FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 300))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -158,10 +195,28 @@ AUTH_USER_MODEL = 'core.User'
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'user.authentication.CachedTokenAuthentication',
     ),
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 100)),
 }
 
+# Set API_ORJSON=1 to render and parse API JSON with orjson.
+if int(os.environ.get('API_ORJSON', 0)):
+    REST_FRAMEWORK.update({
+        'DEFAULT_RENDERER_CLASSES': [
+            'core.renderers.ORJSONRenderer',
+            'rest_framework.renderers.BrowsableAPIRenderer',
+        ],
+        'DEFAULT_PARSER_CLASSES': [
+            'core.parsers.ORJSONParser',
+            'rest_framework.parsers.FormParser',
+            'rest_framework.parsers.MultiPartParser',
+        ],
+    })
+
+# Pagination classes are set per viewset, PAGE_SIZE is their default size.
+SILENCED_SYSTEM_CHECKS = ['rest_framework.W001']
+
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
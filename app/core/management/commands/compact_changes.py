@@ -0,0 +1,17 @@
+"""
+Django command to compact the change log read by the sync API.
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import Change
+
+
+class Command(BaseCommand):
+    """Django command keeping only the latest change of each object."""
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        deleted = Change.objects.compact()
+        self.stdout.write(
+            self.style.SUCCESS(f'Removed {deleted} superseded changes.')
+        )
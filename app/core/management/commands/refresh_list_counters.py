@@ -0,0 +1,44 @@
+"""
+Django command to rebuild or verify stored shopping list counters.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import ShopList, Change
+
+
+class Command(BaseCommand):
+    """Django command to refresh shopping list totals and item counts."""
+
+    def add_arguments(self, parser):
+        """Arguments for command line."""
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Report lists with stale counters without fixing them',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        stale = ShopList.objects.with_stale_counters()
+
+        if options['check']:
+            found = False
+            for shoplist in stale:
+                found = True
+                self.stdout.write(
+                    f'ShopList {shoplist.id}: '
+                    f'total {shoplist.total} != {shoplist.actual_total}, '
+                    f'item_count {shoplist.item_count} '
+                    f'!= {shoplist.actual_item_count}'
+                )
+            if found:
+                raise CommandError('Stale shopping list counters found.')
+            self.stdout.write(self.style.SUCCESS('All counters up to date.'))
+            return
+
+        changes = list(stale.values_list('user_id', 'id'))
+        updated = ShopList.objects.filter(
+            id__in=[shoplist_id for _, shoplist_id in changes],
+        ).refresh_counters()
+        Change.objects.record(ShopList, changes)
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {updated} lists.'))
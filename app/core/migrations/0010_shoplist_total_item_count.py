@@ -0,0 +1,53 @@
+# Generated by Django 4.0.10 on 2026-10-17 20:35
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    """Compute counters for lists created before they were stored."""
+    ShopList = apps.get_model('core', 'ShopList')
+    memberships = ShopList.items.through.objects.filter(
+        shoplist=models.OuterRef('pk'),
+    ).order_by().values('shoplist')
+    ShopList.objects.update(
+        total=Coalesce(
+            models.Subquery(
+                memberships.annotate(
+                    total=models.Sum('item__price'),
+                ).values('total'),
+            ),
+            models.Value(Decimal('0.00')),
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ),
+        item_count=Coalesce(
+            models.Subquery(
+                memberships.annotate(
+                    item_count=models.Count('item'),
+                ).values('item_count'),
+            ),
+            models.Value(0),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_shoplist_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shoplist',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='shoplist',
+            name='total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.0.10 on 2026-10-17 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_shoplist_total_item_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user', 'name', 'id'], name='category_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('private', False)), fields=['name'], name='category_shared_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['user', 'name', 'id'], name='item_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shoplist',
+            index=models.Index(fields=['user', '-id'], name='shoplist_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shoplist',
+            index=models.Index(fields=['user', '-active', '-id'], name='shoplist_user_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='store',
+            index=models.Index(fields=['user', 'name', 'id'], name='store_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='store',
+            index=models.Index(condition=models.Q(('private', False)), fields=['name'], name='store_shared_idx'),
+        ),
+    ]
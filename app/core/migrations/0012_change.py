@@ -0,0 +1,44 @@
+# Generated by Django 4.0.10 on 2026-10-17 20:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def log_existing_objects(apps, schema_editor):
+    """Log existing objects so a sync from the start returns them."""
+    Change = apps.get_model('core', 'Change')
+    for kind in ('category', 'store', 'item', 'shoplist'):
+        model = apps.get_model('core', kind)
+        Change.objects.bulk_create(
+            (
+                Change(user_id=user_id, kind=kind, object_id=object_id)
+                for user_id, object_id in model.objects.order_by('id')
+                .values_list('user_id', 'id').iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_per_user_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('shoplist', 'Shopping list'), ('item', 'Item'), ('category', 'Category'), ('store', 'Store')], max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='changes', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['user', 'id'], name='change_user_id_idx'),
+        ),
+        migrations.RunPython(log_existing_objects, migrations.RunPython.noop),
+    ]
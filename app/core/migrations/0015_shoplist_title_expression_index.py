@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-17 21:52
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='shoplist',
+            name='shoplist_user_title_idx',
+        ),
+        migrations.AddIndex(
+            model_name='shoplist',
+            index=models.Index(django.db.models.expressions.F('user'), django.db.models.functions.comparison.Coalesce(django.db.models.functions.comparison.NullIf('title', django.db.models.expressions.Value('')), django.db.models.expressions.Func(django.db.models.expressions.Value('ShopList'), django.db.models.functions.comparison.Cast('id', models.CharField()), arg_joiner=' || ', template='(%(expressions)s)')), django.db.models.expressions.F('id'), name='shoplist_user_title_idx'),
+        ),
+    ]
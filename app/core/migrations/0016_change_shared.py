@@ -0,0 +1,22 @@
+# Generated by Django 4.0.10 on 2026-10-17 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_shoplist_title_expression_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='shared',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(condition=models.Q(('shared', True)), fields=['id'], name='change_shared_id_idx'),
+        ),
+    ]
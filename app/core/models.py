@@ -1,9 +1,19 @@
 """
 Database models.
 """
+import re
+from decimal import Decimal
+
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
 from django.urls import reverse
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -16,9 +26,146 @@ class NameField(models.CharField):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def get_prep_value(self, value):
+    @staticmethod
+    def normalize(value):
+        """Return value as it is stored in the database."""
         return str(value).title()
 
+    def get_prep_value(self, value):
+        return self.normalize(value)
+
+
+def name_search_vector():
+    """Return the full-text search vector over object names."""
+    return SearchVector('name', config='simple')
+
+
+def shoplist_title():
+    """Return the expression for a list's title, or its default title.
+
+    Matches ShopList.default_title, concatenating with || so that it can
+    be indexed, which CONCAT() cannot.
+    """
+    return Coalesce(
+        NullIf('title', models.Value('')),
+        models.Func(
+            models.Value('ShopList'),
+            Cast('id', models.CharField()),
+            template='(%(expressions)s)',
+            arg_joiner=' || ',
+        ),
+    )
+
+
+def _delete_rows(model, ids):
+    """Delete rows of model by id in one statement, sending no signals."""
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE id = ANY(%s)', [ids])
+
+
+class NamedQuerySet(models.QuerySet):
+    """Queryset for objects with names unique per user."""
+
+    def bulk_delete(self):
+        """Delete the categories or stores with set-based queries.
+
+        No per-object signals are sent. Instead, items losing a deleted
+        tag have it cleared, and are logged as changed with the deletions.
+        """
+        rows = list(self.values_list('user_id', 'id', 'private'))
+        ids = [pk for _, pk, _ in rows]
+        field = self.model._meta.model_name
+        tagged = Item.objects.filter(**{f'{field}_id__in': ids})
+        with transaction.atomic(savepoint=False):
+            item_rows = list(tagged.values_list('user_id', 'id'))
+            tagged.update(**{field: None})
+            _delete_rows(self.model, ids)
+            Change.objects.record_many([
+                (self.model, [r[:2] for r in rows if r[2]], False),
+                (self.model, [r[:2] for r in rows if not r[2]], True),
+                (Item, item_rows, False),
+            ])
+
+    def search(self, text):
+        """Filter to names with words starting with those in text.
+
+        Matches are ordered best first, then by name, and are found with
+        the name search index.
+        """
+        words = re.findall(r'\w+', text)
+        if not words:
+            return self.none()
+        query = SearchQuery(
+            ' & '.join(f'{word}:*' for word in words),
+            config='simple',
+            search_type='raw',
+        )
+        return self.annotate(search=name_search_vector()).filter(
+            search=query,
+        ).order_by(SearchRank(name_search_vector(), query).desc(), 'name')
+
+    def bulk_get_or_create(self, user, objs):
+        """Return user's objects keyed by name, creating any that are missing.
+
+        objs maps names to the field values used for objects that need to
+        be created. Missing objects are inserted in a single statement and
+        names in the result are normalized as they are stored.
+        """
+        objs = {
+            NameField.normalize(name): values
+            for name, values in objs.items()
+        }
+        found = {
+            obj.name: obj
+            for obj in self.filter(user=user, name__in=objs)
+        }
+        missing = [
+            self.model(user=user, name=name, **values)
+            for name, values in objs.items() if name not in found
+        ]
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            created = self.filter(
+                user=user,
+                name__in=[obj.name for obj in missing],
+            )
+            found.update((obj.name, obj) for obj in created)
+            Change.objects.record(
+                self.model,
+                [(user.pk, obj.id) for obj in created],
+            )
+        return found
+
+
+class ItemQuerySet(NamedQuerySet):
+    """Queryset for items."""
+
+    def bulk_delete(self):
+        """Delete the items with set-based queries and log the changes.
+
+        No per-object signals are sent. Instead, lists holding the items
+        have their counters recomputed, and are logged with the deletions.
+        """
+        rows = list(self.values_list('user_id', 'id'))
+        ids = [pk for _, pk in rows]
+        memberships = ShopList.items.through.objects.filter(item_id__in=ids)
+        with transaction.atomic(savepoint=False):
+            list_rows = list(
+                ShopList.objects.filter(
+                    id__in=memberships.values('shoplist_id'),
+                ).values_list('user_id', 'id')
+            )
+            memberships.delete()
+            _delete_rows(Item, ids)
+            ShopList.objects.filter(
+                id__in=[pk for _, pk in list_rows],
+            ).refresh_counters()
+            Change.objects.record_many([
+                (Item, rows, False),
+                (ShopList, list_rows, False),
+            ])
+
 
 class UserManager(BaseUserManager):
     """Manager for users."""
@@ -56,8 +203,69 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
 
 
+class ShopListQuerySet(models.QuerySet):
+    """Queryset for shopping lists."""
+
+    def with_items(self, related=('category', 'store')):
+        """Prefetch items along with their related tags."""
+        return self.prefetch_related(ShopList.item_prefetch(related))
+
+    def toggle_active(self, user, pk):
+        """Flip the active flag of user's list pk in a single statement.
+
+        Returns the new flag, or None if user has no list pk. Concurrent
+        toggles each flip the flag in turn, as none reads it beforehand.
+        """
+        pk = str(pk)
+        if not (pk.isascii() and pk.isdigit()):
+            return None
+        pk = int(pk)
+        table = connection.ops.quote_name(ShopList._meta.db_table)
+        with transaction.atomic(savepoint=False), \
+                connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET active = NOT active '
+                f'WHERE id = %s AND user_id = %s RETURNING active',
+                [pk, user.pk],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            Change.objects.record(ShopList, [(user.pk, pk)])
+        return row[0]
+
+    def bulk_delete(self):
+        """Delete the lists with set-based queries and log the changes.
+
+        No per-object signals are sent.
+        """
+        rows = list(self.values_list('user_id', 'id'))
+        ids = [pk for _, pk in rows]
+        with transaction.atomic(savepoint=False):
+            ShopList.items.through.objects.filter(shoplist_id__in=ids).delete()
+            _delete_rows(ShopList, ids)
+            Change.objects.record(ShopList, rows)
+
+    def refresh_counters(self):
+        """Recompute stored totals and item counts from list items."""
+        return self.update(**ShopList.counter_expressions())
+
+    def with_stale_counters(self):
+        """Filter to lists whose stored counters disagree with their items."""
+        expressions = ShopList.counter_expressions()
+        return self.annotate(
+            actual_total=expressions['total'],
+            actual_item_count=expressions['item_count'],
+        ).exclude(
+            total=models.F('actual_total'),
+            item_count=models.F('actual_item_count'),
+        )
+
+
 class ShopList(models.Model):
     """Shopping list object."""
+    COUNTER_FIELDS = ('total', 'item_count')
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -66,16 +274,116 @@ class ShopList(models.Model):
     title = models.CharField(max_length=64, blank=True)
     items = models.ManyToManyField('Item', blank=True)
     active = models.BooleanField('Active', default=True)
+    total = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        editable=False,
+    )
+    item_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Default title given to a list stored without one, see from_db().
+    _derived_title = None
+
+    objects = ShopListQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', '-id'],
+                name='shoplist_user_id_idx',
+            ),
+            models.Index(
+                fields=['user', '-active', '-id'],
+                name='shoplist_user_active_idx',
+            ),
+            models.Index(
+                fields=['user', 'total', 'id'],
+                name='shoplist_user_total_idx',
+            ),
+            models.Index(
+                models.F('user'),
+                shoplist_title(),
+                models.F('id'),
+                name='shoplist_user_title_idx',
+            ),
+        ]
 
-    @property
-    def total(self):
-        return sum([item.price for item in self.items.all()])
+    @staticmethod
+    def item_prefetch(related=('category', 'store')):
+        """Return the prefetch that loads items with related tags."""
+        items = Item.objects.all()
+        if related:
+            items = items.select_related(*related)
+        return models.Prefetch('items', queryset=items)
+
+    @staticmethod
+    def counter_expressions():
+        """Return expressions computing each counter from list items."""
+        memberships = ShopList.items.through.objects.filter(
+            shoplist=models.OuterRef('pk'),
+        ).order_by().values('shoplist')
+        return {
+            'total': Coalesce(
+                models.Subquery(
+                    memberships.annotate(
+                        total=models.Sum('item__price'),
+                    ).values('total'),
+                ),
+                models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(
+                    max_digits=12,
+                    decimal_places=2,
+                ),
+            ),
+            'item_count': Coalesce(
+                models.Subquery(
+                    memberships.annotate(
+                        item_count=models.Count('item'),
+                    ).values('item_count'),
+                ),
+                models.Value(0),
+            ),
+        }
 
     def save(self, *args, **kwargs):
+        """Save the list without overwriting its stored counters.
+
+        Counters are only ever changed in the database by core.signals, so
+        a full save of an existing list leaves them out of the UPDATE. So
+        is a default title, which stays derived rather than stored.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            derived = self.title == self._derived_title
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and not (field.name == 'title' and derived)
+            ]
         super().save(*args, **kwargs)
         if not self.title:
-            self.title = f'ShopList{self.id}'
-            self.save(*args, **kwargs)
+            self.title = self._derived_title = self.default_title(self.id)
+        elif self.title != self._derived_title:
+            self._derived_title = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Give lists stored without a title their default title."""
+        instance = super().from_db(db, field_names, values)
+        if 'title' in field_names and not instance.title:
+            instance.title = cls.default_title(instance.id)
+            instance._derived_title = instance.title
+        return instance
+
+    @staticmethod
+    def default_title(pk):
+        """Return the title of list pk when it was saved without one.
+
+        The title is derived when lists are read, so saving an untitled
+        list is a single write. shoplist_title() derives it in queries.
+        """
+        return f'ShopList{pk}'
 
     def get_absolute_url(self):
         return reverse(
@@ -112,9 +420,19 @@ class Item(models.Model):
         on_delete=models.SET_NULL,
     )
 
+    objects = ItemQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored price so list totals can be adjusted."""
+        instance = super().from_db(db, field_names, values)
+        if 'price' in field_names:
+            instance._saved_price = values[field_names.index('price')]
+        return instance
+
     def get_absolute_url(self):
         return reverse('user_items')
 
@@ -123,6 +441,22 @@ class Item(models.Model):
             models.UniqueConstraint(fields=['name', 'user'],
                                     name='unique_item'),
         ]
+        indexes = [
+            models.Index(
+                fields=['user', 'name', 'id'],
+                name='item_user_name_idx',
+            ),
+            models.Index(
+                fields=['user', 'name'],
+                opclasses=['int8_ops', 'varchar_pattern_ops'],
+                name='item_user_name_prefix_idx',
+            ),
+            models.Index(
+                fields=['user', 'price', 'id'],
+                name='item_user_price_idx',
+            ),
+            GinIndex(name_search_vector(), name='item_name_search_idx'),
+        ]
 
 
 class Category(models.Model):
@@ -135,6 +469,8 @@ class Category(models.Model):
     )
     private = models.BooleanField(default=True, editable=False)
 
+    objects = NamedQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -144,6 +480,18 @@ class Category(models.Model):
             models.UniqueConstraint(fields=['name', 'user'],
                                     name='unique_category'),
         ]
+        indexes = [
+            models.Index(
+                fields=['user', 'name', 'id'],
+                name='category_user_name_idx',
+            ),
+            models.Index(
+                fields=['name'],
+                condition=models.Q(private=False),
+                name='category_shared_idx',
+            ),
+            GinIndex(name_search_vector(), name='category_name_search_idx'),
+        ]
 
 
 class Store(models.Model):
@@ -156,6 +504,8 @@ class Store(models.Model):
     )
     private = models.BooleanField(default=True, editable=False)
 
+    objects = NamedQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -164,3 +514,148 @@ class Store(models.Model):
             models.UniqueConstraint(fields=['name', 'user'],
                                     name='unique_store'),
         ]
+        indexes = [
+            models.Index(
+                fields=['user', 'name', 'id'],
+                name='store_user_name_idx',
+            ),
+            models.Index(
+                fields=['name'],
+                condition=models.Q(private=False),
+                name='store_shared_idx',
+            ),
+            GinIndex(name_search_vector(), name='store_name_search_idx'),
+        ]
+
+
+# Advisory lock ordering shared changes, below the ids of users' locks.
+SHARED_LOCK = 0
+
+
+class ChangeQuerySet(models.QuerySet):
+    """Queryset for the log of changes to users' shopping data."""
+
+    def record(self, model, changes, shared=False):
+        """Log changes to objects of model.
+
+        changes holds (user_id, object_id) pairs. Each user's log is written
+        under a transaction advisory lock, so their change ids commit in
+        order and a sync cursor never skips a change committed late. Changes
+        to objects shared with every user are marked shared, and ordered
+        under a lock of their own.
+        """
+        self.record_many([(model, changes, shared)])
+
+    def record_many(self, groups):
+        """Log (model, changes, shared) groups of changes in one write."""
+        groups = [
+            (model, set(changes), shared)
+            for model, changes, shared in groups
+        ]
+        user_ids = sorted({
+            user_id
+            for _, changes, _ in groups
+            for user_id, _ in changes
+        })
+        if not user_ids:
+            return
+        if any(shared and changes for _, changes, shared in groups):
+            locks = [SHARED_LOCK] + user_ids
+        else:
+            locks = user_ids
+        with transaction.atomic(savepoint=False):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT pg_advisory_xact_lock(u) '
+                    'FROM (SELECT unnest(%s::bigint[]) AS u ORDER BY u) s',
+                    [locks],
+                )
+            self.bulk_create([
+                self.model(
+                    user_id=user_id,
+                    kind=model._meta.model_name,
+                    object_id=object_id,
+                    shared=shared,
+                )
+                for model, changes, shared in groups
+                for user_id, object_id in changes
+            ])
+
+    def compact(self):
+        """Delete every entry superseded by a later one for its object.
+
+        A sync only needs the latest entry of each object, as it reads the
+        object's current state or records its deletion, so the log stays
+        proportional to the objects it covers. Shared and other entries
+        are kept apart, so neither version moves back. Returns the number
+        of entries deleted.
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {table} WHERE id IN ('
+                f'SELECT id FROM (SELECT id, row_number() OVER ('
+                f'PARTITION BY user_id, kind, object_id, shared '
+                f'ORDER BY id DESC) AS n FROM {table}) ranked WHERE n > 1)'
+            )
+            return cursor.rowcount
+
+    def version(self, user_id):
+        """Return the id of a user's latest change, or 0 if there is none.
+
+        It moves on every committed write to the user's data, in every
+        process, so it keys caches of that data.
+        """
+        return self.filter(user_id=user_id).aggregate(
+            version=Coalesce(models.Max('id'), 0),
+        )['version']
+
+    def shared_version(self):
+        """Return the id of the latest shared change, or 0 if there is none.
+
+        It keys caches of the categories and stores shared with every user.
+        """
+        return self.filter(shared=True).aggregate(
+            version=Coalesce(models.Max('id'), 0),
+        )['version']
+
+
+class Change(models.Model):
+    """Change to a user's list, item, category or store.
+
+    An entry whose object no longer exists records its deletion.
+    """
+    KINDS = [
+        ('shoplist', 'Shopping list'),
+        ('item', 'Item'),
+        ('category', 'Category'),
+        ('store', 'Store'),
+    ]
+
+    # Deleting a user cascades to their objects, whose deletion is logged
+    # after the user's changes are removed, so there is no FK constraint.
+    # core.signals removes those entries once the user itself is deleted.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='changes',
+    )
+    kind = models.CharField(max_length=16, choices=KINDS)
+    object_id = models.BigIntegerField()
+    shared = models.BooleanField(default=False)
+
+    objects = ChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'], name='change_user_id_idx'),
+            models.Index(
+                fields=['id'],
+                condition=models.Q(shared=True),
+                name='change_shared_id_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}'
@@ -0,0 +1,208 @@
+"""
+Signal handlers keeping stored list counters and the change log in sync.
+"""
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import (
+    Count,
+    DecimalField,
+    F,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.contrib.auth import get_user_model
+from django.dispatch import receiver
+
+from core.models import ShopList, Item, Category, Store, Change
+
+
+def _sum_items(items):
+    """Return the summed price and number of items."""
+    return items.aggregate(
+        total=Coalesce(
+            Sum('price'),
+            Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+        item_count=Count('id'),
+    )
+
+
+def _adjust_counters(shoplists, total, item_count):
+    """Add total and item_count to the stored counters of shoplists."""
+    shoplists.update(
+        total=F('total') + total,
+        item_count=F('item_count') + item_count,
+    )
+
+
+def _record_lists(user_id, shoplist_ids):
+    """Log lists whose counters changed as changed for user_id."""
+    Change.objects.record(
+        ShopList,
+        [(user_id, shoplist_id) for shoplist_id in shoplist_ids],
+    )
+
+
+def _stored_price(item):
+    """Return an item's price as it is written to the database."""
+    field = Item._meta.get_field('price')
+    return Decimal(field.get_db_prep_save(item.price, connection))
+
+
+def _update_list(shoplist, action, pk_set):
+    """Adjust a list's counters when items are added or removed."""
+    if action == 'pre_remove':
+        shoplist._removed_counters = _sum_items(
+            shoplist.items.filter(pk__in=pk_set),
+        )
+    elif action == 'post_clear':
+        ShopList.objects.filter(pk=shoplist.pk).update(
+            total=Decimal('0.00'),
+            item_count=0,
+        )
+        shoplist.total = Decimal('0.00')
+        shoplist.item_count = 0
+        _record_lists(shoplist.user_id, [shoplist.pk])
+    elif action in ('post_add', 'post_remove'):
+        if action == 'post_add':
+            delta = _sum_items(Item.objects.filter(pk__in=pk_set))
+            sign = 1
+        else:
+            delta = shoplist.__dict__.pop('_removed_counters')
+            sign = -1
+        total = sign * delta['total']
+        item_count = sign * delta['item_count']
+        _adjust_counters(
+            ShopList.objects.filter(pk=shoplist.pk),
+            total,
+            item_count,
+        )
+        shoplist.total += total
+        shoplist.item_count += item_count
+        _record_lists(shoplist.user_id, [shoplist.pk])
+
+
+def _update_item_lists(item, action, pk_set):
+    """Adjust counters of lists an item is added to or removed from."""
+    price = Subquery(Item.objects.filter(pk=item.pk).values('price'))
+    if action == 'pre_remove':
+        item._removed_from = list(
+            item.shoplist_set.filter(pk__in=pk_set)
+                             .values_list('pk', flat=True)
+        )
+    elif action == 'pre_clear':
+        item._removed_from = list(
+            item.shoplist_set.values_list('pk', flat=True)
+        )
+    elif action == 'post_add':
+        _adjust_counters(ShopList.objects.filter(pk__in=pk_set), price, 1)
+        _record_lists(item.user_id, pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        removed_from = item.__dict__.pop('_removed_from')
+        _adjust_counters(
+            ShopList.objects.filter(pk__in=removed_from),
+            -price,
+            -1,
+        )
+        _record_lists(item.user_id, removed_from)
+
+
+@receiver(m2m_changed, sender=ShopList.items.through)
+def update_counters_for_membership(sender, instance, action, reverse,
+                                   pk_set, **kwargs):
+    """Keep list counters in step with items being added and removed."""
+    if reverse:
+        _update_item_lists(instance, action, pk_set)
+    else:
+        _update_list(instance, action, pk_set)
+
+
+@receiver(post_save, sender=Item)
+def update_totals_for_price(sender, instance, created, **kwargs):
+    """Recompute the totals of an item's lists when its price changes.
+
+    Totals are recomputed from the stored prices rather than adjusted by
+    the difference from the loaded price, which a concurrent update of
+    the same item may already have replaced.
+    """
+    if 'price' in instance.get_deferred_fields():
+        return
+    price = _stored_price(instance)
+    if not created and getattr(instance, '_saved_price', None) != price:
+        lists = ShopList.objects.filter(items=instance)
+        lists.refresh_counters()
+        Change.objects.record(ShopList, lists.values_list('user_id', 'id'))
+    instance._saved_price = price
+
+
+@receiver(pre_delete, sender=Item)
+def update_counters_for_deleted_item(sender, instance, **kwargs):
+    """Remove a deleted item from the counters of its lists."""
+    lists = ShopList.objects.filter(items=instance)
+    Change.objects.record(ShopList, lists.values_list('user_id', 'id'))
+    _adjust_counters(
+        lists,
+        -Subquery(Item.objects.filter(pk=instance.pk).values('price')),
+        -1,
+    )
+
+
+@receiver(post_save, sender=ShopList)
+@receiver(post_delete, sender=ShopList)
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Store)
+@receiver(post_delete, sender=Store)
+def record_change(sender, instance, **kwargs):
+    """Log a saved or deleted object as changed for its owner.
+
+    Changes to categories and stores shared with every user are marked
+    shared, which moves the version of the shared tags.
+    """
+    Change.objects.record(
+        sender,
+        [(instance.user_id, instance.pk)],
+        shared=getattr(instance, 'private', True) is False,
+    )
+
+
+def _record_tagged_items(tag):
+    """Log items showing a category or store as changed for their owners."""
+    field = 'category' if isinstance(tag, Category) else 'store'
+    Change.objects.record(
+        Item,
+        Item.objects.filter(**{field: tag}).values_list('user_id', 'id'),
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Store)
+def record_saved_tag_items(sender, instance, created, **kwargs):
+    """Log items of any user using a renamed category or store."""
+    if not created:
+        _record_tagged_items(instance)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Store)
+def record_deleted_tag_items(sender, instance, **kwargs):
+    """Log items of any user losing a category or store."""
+    _record_tagged_items(instance)
+
+
+@receiver(post_delete, sender=get_user_model())
+def delete_user_changes(sender, instance, **kwargs):
+    """Remove changes logged while a deleted user's objects cascaded."""
+    Change.objects.filter(user_id=instance.pk).delete()
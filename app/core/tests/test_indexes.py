@@ -0,0 +1,128 @@
+"""
+Tests that hot queries are served by indexes.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+
+from core import models
+
+
+def create_user(email):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email, 'pass123')
+
+
+class IndexUsageTests(TestCase):
+    """Test query plans of per-user access paths."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user@example.com')
+        defaults = create_user('defaults@example.com')
+        for user in (cls.user, defaults):
+            for i in range(50):
+                models.ShopList.objects.create(
+                    user=user,
+                    title=f'list {i}',
+                    active=i % 2 == 0,
+                )
+                models.Item.objects.create(
+                    user=user,
+                    name=f'item {i}',
+                    price=i,
+                )
+                models.Category.objects.create(
+                    user=user,
+                    name=f'category {i}',
+                    private=user == cls.user,
+                )
+                models.Store.objects.create(
+                    user=user,
+                    name=f'store {i}',
+                    private=user == cls.user,
+                )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertIndexScan(self, queryset, ordered=True):
+        """Assert queryset avoids sequential scans, and sorts if ordered."""
+        plan = queryset.explain()
+
+        self.assertNotIn('Seq Scan', plan)
+        if ordered:
+            self.assertNotIn('Sort', plan)
+
+    def test_shoplist_api_queries(self):
+        """Test lists are read newest first from an index."""
+        self.assertIndexScan(
+            models.ShopList.objects.filter(user=self.user).order_by('-id')
+        )
+
+    def test_shoplist_filter_queries(self):
+        """Test lists filtered or ordered by total or title use indexes."""
+        lists = models.ShopList.objects.filter(user=self.user)
+        self.assertIndexScan(lists.filter(active=True).order_by('-id'))
+        self.assertIndexScan(
+            lists.filter(total__gte=1, total__lte=10).order_by('total', 'id')
+        )
+        self.assertIndexScan(
+            lists.order_by(models.shoplist_title().desc(), '-id')
+        )
+
+    def test_shoplist_frontend_queries(self):
+        """Test lists are read active first from an index."""
+        self.assertIndexScan(
+            models.ShopList.objects.filter(user=self.user)
+                                   .order_by('-active', '-id')
+        )
+
+    def test_named_api_queries(self):
+        """Test items, categories and stores are read by name."""
+        for model in (models.Item, models.Category, models.Store):
+            with self.subTest(model=model.__name__):
+                self.assertIndexScan(
+                    model.objects.filter(user=self.user)
+                                 .order_by('-name', '-id')
+                )
+                self.assertIndexScan(
+                    model.objects.filter(user=self.user).order_by('name')
+                )
+
+    def test_item_filter_queries(self):
+        """Test items filtered by price, name or tag use indexes."""
+        items = models.Item.objects.filter(user=self.user)
+        self.assertIndexScan(
+            items.filter(price__gte=1, price__lte=10).order_by('price', 'id')
+        )
+        self.assertIndexScan(
+            items.filter(name__startswith='Item 1'),
+            ordered=False,
+        )
+        self.assertIndexScan(items.filter(category=1), ordered=False)
+        self.assertIndexScan(items.filter(store=1), ordered=False)
+
+    def test_name_search_queries(self):
+        """Test name searches use the full-text indexes."""
+        for model in (models.Item, models.Category, models.Store):
+            with self.subTest(model=model.__name__):
+                self.assertIndexScan(
+                    model.objects.search('item 1'),
+                    ordered=False,
+                )
+
+    def test_shared_tag_queries(self):
+        """Test own and shared categories and stores use indexes."""
+        for model in (models.Category, models.Store):
+            with self.subTest(model=model.__name__):
+                self.assertIndexScan(
+                    model.objects.filter(
+                        Q(user=self.user) | Q(private=False)
+                    ).order_by('-private', 'name'),
+                    ordered=False,
+                )
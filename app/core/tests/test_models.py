@@ -1,6 +1,8 @@
 """
 Tests for models.
 """
+from decimal import Decimal
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -90,3 +92,183 @@ class ModelTests(TestCase):
         )
 
         self.assertEqual(str(store), store.name)
+
+    def test_shopping_list_counters(self):
+        """Test list total and item count follow list membership."""
+        user = create_user()
+        sl = models.ShopList.objects.create(user=user, title='slist')
+        tea = models.Item.objects.create(user=user, name='tea', price=3.50)
+        milk = models.Item.objects.create(user=user, name='milk', price=2)
+
+        sl.items.add(tea, milk)
+        self.assertEqual((sl.total, sl.item_count), (Decimal('5.50'), 2))
+
+        sl.items.remove(milk, milk)
+        sl.refresh_from_db()
+        self.assertEqual((sl.total, sl.item_count), (Decimal('3.50'), 1))
+
+        milk.shoplist_set.add(sl)
+        sl.refresh_from_db()
+        self.assertEqual((sl.total, sl.item_count), (Decimal('5.50'), 2))
+
+        tea.shoplist_set.clear()
+        sl.refresh_from_db()
+        self.assertEqual((sl.total, sl.item_count), (Decimal('2.00'), 1))
+
+        sl.items.clear()
+        sl.refresh_from_db()
+        self.assertEqual((sl.total, sl.item_count), (Decimal('0.00'), 0))
+
+    def test_shopping_list_counters_follow_items(self):
+        """Test list totals follow item price changes and deletion."""
+        user = create_user()
+        sl = models.ShopList.objects.create(user=user, title='slist')
+        tea = models.Item.objects.create(user=user, name='tea', price=3.50)
+        milk = models.Item.objects.create(user=user, name='milk', price=2)
+        sl.items.add(tea, milk)
+
+        tea.price = 4.05
+        tea.save()
+        sl.refresh_from_db()
+        self.assertEqual(sl.total, Decimal('6.05'))
+
+        milk = models.Item.objects.get(id=milk.id)
+        milk.price = Decimal('1.25')
+        milk.save()
+        sl.refresh_from_db()
+        self.assertEqual(sl.total, Decimal('5.30'))
+
+        milk.delete()
+        sl.refresh_from_db()
+        self.assertEqual((sl.total, sl.item_count), (Decimal('4.05'), 1))
+        self.assertFalse(models.ShopList.objects.with_stale_counters())
+
+    def test_shopping_list_counters_stale_item_price(self):
+        """Test saving a stale item instance keeps list totals correct."""
+        user = create_user()
+        sl = models.ShopList.objects.create(user=user, title='slist')
+        tea = models.Item.objects.create(user=user, name='tea', price=1)
+        sl.items.add(tea)
+        stale = models.Item.objects.get(id=tea.id)
+
+        tea.price = 3
+        tea.save()
+        stale.price = 4
+        stale.save()
+
+        sl.refresh_from_db()
+        self.assertEqual(sl.total, Decimal('4.00'))
+
+    def test_shopping_list_save_keeps_counters(self):
+        """Test saving a stale list instance keeps stored counters."""
+        user = create_user()
+        sl = models.ShopList.objects.create(user=user, title='slist')
+        stale = models.ShopList.objects.get(id=sl.id)
+        sl.items.add(
+            models.Item.objects.create(user=user, name='tea', price=3),
+        )
+
+        stale.title = 'renamed'
+        stale.save()
+
+        sl.refresh_from_db()
+        self.assertEqual(sl.title, 'renamed')
+        self.assertEqual((sl.total, sl.item_count), (Decimal('3.00'), 1))
+
+    def test_changes_logged(self):
+        """Test saving and deleting objects logs them as changed."""
+        user = create_user()
+        sl = models.ShopList.objects.create(user=user, title='slist')
+        item = models.Item.objects.create(user=user, name='tea', price=3)
+        sl.items.add(item)
+        item_id = item.id
+        item.delete()
+
+        changes = list(
+            models.Change.objects.filter(user=user)
+                                 .order_by('id')
+                                 .values_list('kind', 'object_id')
+        )
+        self.assertEqual(changes[-2:], [
+            ('shoplist', sl.id),
+            ('item', item_id),
+        ])
+
+    def test_shared_changes_versioned(self):
+        """Test only changes to shared tags move the shared version."""
+        user = create_user()
+        versions = models.Change.objects.shared_version
+
+        models.Category.objects.create(user=user, name='mine')
+        self.assertEqual(versions(), 0)
+
+        store = models.Store.objects.create(
+            user=user,
+            name='market',
+            private=False,
+        )
+        created = versions()
+        store.delete()
+
+        self.assertGreater(created, 0)
+        self.assertGreater(versions(), created)
+        self.assertEqual(
+            versions(),
+            models.Change.objects.version(user.id),
+        )
+
+    def test_shopping_list_default_title(self):
+        """Test untitled lists are titled by id without storing it."""
+        user = create_user()
+        sl = models.ShopList.objects.create(user=user)
+
+        self.assertEqual(sl.title, f'ShopList{sl.id}')
+        self.assertEqual(
+            models.ShopList.objects.get(id=sl.id).title,
+            f'ShopList{sl.id}',
+        )
+        self.assertEqual(
+            models.ShopList.objects.values_list('title', flat=True).get(),
+            '',
+        )
+
+    def test_toggle_active(self):
+        """Test toggling flips a list's flag and logs the change."""
+        user = create_user()
+        other = create_user('other@example.com')
+        sl = models.ShopList.objects.create(user=user, title='slist')
+
+        toggle = models.ShopList.objects.toggle_active
+
+        self.assertIs(toggle(user, sl.id), False)
+        self.assertIs(toggle(user, sl.id), True)
+        self.assertIsNone(toggle(other, sl.id))
+        self.assertIsNone(toggle(user, 'x'))
+        self.assertIsNone(toggle(user, '²'))
+
+        sl.refresh_from_db()
+        self.assertTrue(sl.active)
+        self.assertEqual(
+            models.Change.objects.filter(
+                user=user,
+                kind='shoplist',
+                object_id=sl.id,
+            ).count(),
+            3,
+        )
+
+    def test_delete_user_with_changes(self):
+        """Test deleting a user deletes their data and change log."""
+        user = create_user()
+        sl = models.ShopList.objects.create(user=user, title='slist')
+        sl.items.add(
+            models.Item.objects.create(user=user, name='tea', price=3),
+        )
+
+        user_id = user.id
+        user.delete()
+
+        self.assertFalse(models.ShopList.objects.filter(id=sl.id).exists())
+        self.assertFalse(
+            models.Change.objects.filter(user_id=user_id).exists(),
+        )
@@ -0,0 +1,103 @@
+"""
+Tests for the orjson renderer and parser.
+"""
+import datetime
+import io
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+
+PAYLOAD = OrderedDict([
+    ('results', [
+        OrderedDict([
+            ('id', 1),
+            ('title', 'Groceries \u2028\u2029 café'),
+            ('items', [
+                {
+                    'id': 2,
+                    'name': 'Milk',
+                    'price': '2.50',
+                    'category': None,
+                    'store': {'id': 3, 'name': 'Corner'},
+                },
+            ]),
+            ('total', Decimal('2.50')),
+            ('item_count', 1),
+            ('active', True),
+        ]),
+    ]),
+    ('next', None),
+    ('created', datetime.datetime(
+        2022, 1, 2, 3, 4, 5, 678901,
+        tzinfo=datetime.timezone.utc,
+    )),
+    ('day', datetime.date(2022, 1, 2)),
+    ('uuid', uuid.UUID(int=1)),
+    ('detail', gettext_lazy('Not found.')),
+    (1, 'non-string key'),
+])
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """Test rendering JSON with orjson."""
+
+    def test_output_matches_json_renderer(self):
+        """Test output is byte for byte that of DRF's JSON renderer."""
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD),
+            JSONRenderer().render(PAYLOAD),
+        )
+
+    def test_indented_output_matches_json_renderer(self):
+        """Test an indent requested by the client is honoured."""
+        media_type = 'application/json; indent=4'
+
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD, media_type),
+            JSONRenderer().render(PAYLOAD, media_type),
+        )
+
+    def test_none_renders_empty(self):
+        """Test no data renders an empty body."""
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ORJSONParserTests(SimpleTestCase):
+    """Test parsing JSON with orjson."""
+
+    def test_parse_matches_json_parser(self):
+        """Test parsed data matches DRF's JSON parser."""
+        body = JSONRenderer().render(PAYLOAD)
+
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_parse_other_encoding(self):
+        """Test bodies in other encodings are decoded first."""
+        body = '{"name": "café"}'.encode('latin-1')
+
+        data = ORJSONParser().parse(
+            io.BytesIO(body),
+            parser_context={'encoding': 'latin-1'},
+        )
+
+        self.assertEqual(data, {'name': 'café'})
+
+    def test_invalid_json(self):
+        """Test invalid JSON raises a parse error."""
+        for body in (b'{"name": ', b'\xff', b'NaN'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    ORJSONParser().parse(io.BytesIO(body))
@@ -2,13 +2,17 @@
 Test custom Django management commands.
 """
 
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2Error
 
-from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+
+from core.models import Change, ShopList, Item
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -33,3 +37,64 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+class RefreshListCountersTests(TestCase):
+    """Test the refresh_list_counters command."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            'user@example.com',
+            'pass123',
+        )
+        self.shoplist = ShopList.objects.create(user=user, title='slist')
+        self.shoplist.items.add(
+            Item.objects.create(user=user, name='tea', price=3),
+        )
+        ShopList.objects.update(total=0, item_count=0)
+
+    def test_check_reports_stale_counters(self):
+        """Test --check fails when counters are stale."""
+        with self.assertRaises(CommandError):
+            call_command('refresh_list_counters', '--check', stdout=StringIO())
+
+    def test_refresh_fixes_stale_counters(self):
+        """Test running the command recomputes counters."""
+        call_command('refresh_list_counters', stdout=StringIO())
+
+        self.shoplist.refresh_from_db()
+        self.assertEqual(self.shoplist.total, 3)
+        self.assertEqual(self.shoplist.item_count, 1)
+        call_command('refresh_list_counters', '--check', stdout=StringIO())
+
+
+class CompactChangesTests(TestCase):
+    """Test the compact_changes command."""
+
+    def test_keeps_latest_change_per_object(self):
+        """Test superseded changes are removed and versions kept."""
+        user = get_user_model().objects.create_user(
+            'user@example.com',
+            'pass123',
+        )
+        shoplist = ShopList.objects.create(user=user, title='slist')
+        item = Item.objects.create(user=user, name='tea', price=3)
+        for price in (4, 5):
+            item.price = price
+            item.save()
+        item_id = item.id
+        item.delete()
+        version = Change.objects.version(user.id)
+
+        out = StringIO()
+        call_command('compact_changes', stdout=out)
+
+        self.assertIn('Removed', out.getvalue())
+        self.assertEqual(
+            sorted(
+                Change.objects.filter(user=user)
+                              .values_list('kind', 'object_id')
+            ),
+            [('item', item_id), ('shoplist', shoplist.id)],
+        )
+        self.assertEqual(Change.objects.version(user.id), version)
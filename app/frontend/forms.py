@@ -4,6 +4,7 @@ Form classes for use on the front end.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 from django import forms
+from django.urls import reverse_lazy
 
 from core import models
 
@@ -40,9 +41,28 @@ class ListCreateForm(forms.ModelForm):
                 'data-live-search': 'true',
                 'data-style': 'btn-primary',
                 'data-selected-text-format': 'count',
+                'data-lookup-url': reverse_lazy('item_lookup'),
             }),
             'title': forms.TextInput(attrs={
                 'class': 'form-control',
                 'style': 'max-width: 270px;'
             }),
         }
+
+    def use_items_of(self, user):
+        """Accept any of user's items, but only render the selected ones.
+
+        Other items are looked up page by page as the picker is used, so
+        the page does not grow with the number of items.
+        """
+        field = self.fields['items']
+        field.queryset = models.Item.objects.filter(user=user)
+        selected = [
+            pk for pk in map(str, self['items'].value() or [])
+            if pk.isdigit()
+        ]
+        field.widget.choices = list(
+            field.queryset.filter(pk__in=selected)
+                          .order_by('name')
+                          .values_list('id', 'name')
+        )
@@ -1,3 +1,389 @@
-from django.test import TestCase  # noqa
+"""
+Tests for the front end views.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.models import Category, Item, ShopList, Store
+
+
+LOOKUP_URL = reverse('item_lookup')
+
+
+def create_user(**params):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class ItemLookupTests(TestCase):
+    """Test the item lookup used by the list forms."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_login(self.user)
+
+    def test_login_required(self):
+        """Test anonymous users are sent to log in."""
+        self.client.logout()
+
+        res = self.client.get(LOOKUP_URL, {'q': 'milk'})
+
+        self.assertEqual(res.status_code, 302)
+
+    def test_lookup_items(self):
+        """Test the user's matching items are returned as options."""
+        milk = Item.objects.create(user=self.user, name='oat milk', price=1)
+        Item.objects.create(user=self.user, name='bread', price=1)
+        other = create_user(email='other@example.com', password='passs')
+        Item.objects.create(user=other, name='milk', price=1)
+
+        res = self.client.get(LOOKUP_URL, {'q': 'mil'})
+
+        self.assertEqual(
+            res.json(),
+            {'results': [{'id': milk.id, 'text': 'Oat Milk'}], 'more': False},
+        )
+
+    def test_lookup_pages(self):
+        """Test all items are returned by name, a page at a time."""
+        for i in range(25):
+            Item.objects.create(user=self.user, name=f'item {i:02}', price=1)
+
+        first = self.client.get(LOOKUP_URL).json()
+        second = self.client.get(LOOKUP_URL, {'page': 2}).json()
+
+        self.assertTrue(first['more'])
+        self.assertFalse(second['more'])
+        self.assertEqual(
+            [item['text'] for item in first['results'] + second['results']],
+            [f'Item {i:02}' for i in range(25)],
+        )
+
+    def test_lookup_invalid_page(self):
+        """Test an invalid page number falls back to the first page."""
+        Item.objects.create(user=self.user, name='tea', price=1)
+
+        for page in ('²', 'x', '0', '-1'):
+            with self.subTest(page=page):
+                res = self.client.get(LOOKUP_URL, {'page': page})
+
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(
+                    [item['text'] for item in res.json()['results']],
+                    ['Tea'],
+                )
+
+
+class ListFormTests(TestCase):
+    """Test the list forms only render the list's own items."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_login(self.user)
+        self.items = [
+            Item.objects.create(user=self.user, name=f'item {i}', price=1)
+            for i in range(3)
+        ]
+
+    def test_new_list_renders_no_items(self):
+        """Test the new list form renders no item options."""
+        res = self.client.get(reverse('new_list'))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertNotContains(res, '<option value=')
+
+    def test_edit_list_renders_current_items(self):
+        """Test the edit form renders only the list's items."""
+        shoplist = ShopList.objects.create(user=self.user, title='food')
+        shoplist.items.add(self.items[1])
+
+        res = self.client.get(reverse('list_edit', args=[shoplist.id]))
+
+        self.assertContains(res, '<option value=', count=1)
+        self.assertContains(
+            res,
+            f'<option value="{self.items[1].id}" selected>Item 1</option>',
+        )
+
+    def test_create_list_with_looked_up_items(self):
+        """Test items not rendered in the form can still be chosen."""
+        res = self.client.post(reverse('new_list'), {
+            'title': 'food',
+            'items': [self.items[0].id, self.items[2].id],
+        })
+
+        shoplist = ShopList.objects.get(user=self.user)
+        self.assertEqual(res.status_code, 302)
+        self.assertEqual(
+            set(shoplist.items.all()),
+            {self.items[0], self.items[2]},
+        )
+
+    def test_other_users_items_rejected(self):
+        """Test items of other users cannot be chosen."""
+        other = create_user(email='other@example.com', password='passs')
+        item = Item.objects.create(user=other, name='milk', price=1)
+
+        res = self.client.post(reverse('new_list'), {
+            'title': 'food',
+            'items': [item.id],
+        })
+
+        self.assertEqual(res.status_code, 200)
+        self.assertFalse(ShopList.objects.exists())
+
+
+class ListDetailTests(TestCase):
+    """Test the list detail page."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_login(self.user)
+
+    def create_list(self, num_items, store=None):
+        """Create and return a list of num_items items from store."""
+        shoplist = ShopList.objects.create(user=self.user, title='food')
+        shoplist.items.add(*[
+            Item.objects.create(
+                user=self.user,
+                name=f'item {shoplist.id} {i}',
+                price=1,
+                store=store,
+            )
+            for i in range(num_items)
+        ])
+        return shoplist
+
+    def test_query_count(self):
+        """Test the page costs the same few queries for any list size."""
+        store = Store.objects.create(user=self.user, name='costco')
+        for num_items in (0, 1, 20):
+            shoplist = self.create_list(num_items, store)
+            url = reverse('lists_detail', args=[shoplist.id, 'food'])
+
+            with self.assertNumQueries(4):
+                res = self.client.get(url)
+
+            self.assertEqual(res.status_code, 200)
+
+    def test_store_image(self):
+        """Test the image of the first item's store is shown if known."""
+        cases = [
+            (Store.objects.create(user=self.user, name='costco'),
+             'assets/costco.jpg'),
+            (Store.objects.create(user=self.user, name='corner'), None),
+            (None, None),
+        ]
+        for store, img_url in cases:
+            with self.subTest(store=store):
+                shoplist = self.create_list(2, store)
+
+                res = self.client.get(
+                    reverse('lists_detail', args=[shoplist.id, 'food']),
+                )
+
+                self.assertEqual(res.context['img_url'], img_url)
+
+
+class ListCompleteTests(TestCase):
+    """Test marking lists complete from the site."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_login(self.user)
+
+    def test_toggle(self):
+        """Test the list is toggled and the detail page shown."""
+        shoplist = ShopList.objects.create(user=self.user, title='food')
+        url = reverse('list_complete', args=[shoplist.id, 'food'])
+
+        res = self.client.get(url)
+
+        self.assertRedirects(
+            res,
+            reverse('lists_detail', args=[shoplist.id, 'food']),
+        )
+        shoplist.refresh_from_db()
+        self.assertFalse(shoplist.active)
+
+    def test_other_users_list(self):
+        """Test other users' lists are not found."""
+        other = create_user(email='other@example.com', password='passs')
+        shoplist = ShopList.objects.create(user=other, title='food')
+
+        res = self.client.get(
+            reverse('list_complete', args=[shoplist.id, 'food']),
+        )
+
+        self.assertEqual(res.status_code, 404)
+        shoplist.refresh_from_db()
+        self.assertTrue(shoplist.active)
+
+
+class CataloguePageTests(TestCase):
+    """Test the items and tags pages."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_login(self.user)
+
+    def create_items(self, num):
+        """Create num items, each with its own category and store."""
+        start = Item.objects.count()
+        for i in range(start, start + num):
+            Item.objects.create(
+                user=self.user,
+                name=f'item {i:03}',
+                price=1,
+                category=Category.objects.create(
+                    user=self.user,
+                    name=f'category {i}',
+                ),
+                store=Store.objects.create(user=self.user, name=f'store {i}'),
+            )
+
+    def test_query_counts(self):
+        """Test the pages cost the same queries for any number of items."""
+        for num in (1, 10):
+            self.create_items(num)
+            for name, queries in (('user_items', 5), ('user_tags', 6)):
+                with self.subTest(page=name, items=num):
+                    cache.clear()
+
+                    with self.assertNumQueries(queries):
+                        res = self.client.get(reverse(name))
+
+                    self.assertEqual(res.status_code, 200)
+
+    def test_items_paginated(self):
+        """Test items are shown 60 to a page, by name."""
+        self.create_items(61)
+
+        first = self.client.get(reverse('user_items'))
+        second = self.client.get(reverse('user_items'), {'page': 2})
+
+        self.assertEqual(len(first.context['item_list']), 60)
+        self.assertContains(first, 'Item 059')
+        self.assertContains(first, '?page=2')
+        self.assertEqual(
+            [item.name for item in second.context['item_list']],
+            ['Item 060'],
+        )
+
+    def test_tags_own_first(self):
+        """Test own tags are listed before shared ones, each by name."""
+        other = create_user(email='other@example.com', password='passs')
+        for user, name, private in [
+            (other, 'aldi', False),
+            (self.user, 'corner', True),
+            (self.user, 'bodega', True),
+        ]:
+            Store.objects.create(user=user, name=name, private=private)
+
+        res = self.client.get(reverse('user_tags'))
+
+        self.assertEqual(
+            [store.name for store in res.context['store_list']],
+            ['Bodega', 'Corner', 'Aldi'],
+        )
+
+
+class FragmentCacheTests(TestCase):
+    """Test list, item and tag pages are cached until their data changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_login(self.user)
+
+    def test_repeat_pages_skip_queries(self):
+        """Test cached pages only query the session, user and versions."""
+        ShopList.objects.create(user=self.user, title='food')
+        Item.objects.create(user=self.user, name='milk', price=1)
+        pages = [('user_lists', 3), ('user_items', 4), ('user_tags', 4)]
+        for name, num in pages:
+            with self.subTest(page=name):
+                self.client.get(reverse(name))
+
+                with self.assertNumQueries(num):
+                    res = self.client.get(reverse(name))
+
+                self.assertEqual(res.status_code, 200)
+
+    def test_changes_shown(self):
+        """Test pages show data changed after they were cached."""
+        self.client.get(reverse('user_lists'))
+        self.client.get(reverse('user_items'))
+
+        ShopList.objects.create(user=self.user, title='hardware')
+        Item.objects.create(user=self.user, name='nails', price=1)
+
+        self.assertContains(self.client.get(reverse('user_lists')), 'hardware')
+        self.assertContains(self.client.get(reverse('user_items')), 'Nails')
+
+    def test_shared_tag_changes_shown(self):
+        """Test the tags page shows shared tags changed by another user."""
+        other = create_user(email='other@example.com', password='passs')
+        self.client.get(reverse('user_tags'))
+
+        Store.objects.create(user=other, name='market', private=False)
+        Category.objects.create(user=other, name='secret')
+
+        res = self.client.get(reverse('user_tags'))
+        self.assertContains(res, 'Market')
+        self.assertNotContains(res, 'Secret')
+
+    def test_other_worker_changes_shown(self):
+        """Test pages show changes made through another worker process."""
+        other = create_user(email='other@example.com', password='passs')
+        self.client.get(reverse('user_lists'))
+        self.client.get(reverse('user_tags'))
+
+        with override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'other-worker',
+            },
+        }):
+            ShopList.objects.create(user=self.user, title='hardware')
+            Store.objects.create(user=other, name='market', private=False)
+
+        self.assertContains(self.client.get(reverse('user_lists')), 'hardware')
+        self.assertContains(self.client.get(reverse('user_tags')), 'Market')
+
+    def test_shared_tag_bulk_rename_shown(self):
+        """Test the tags page shows shared tags renamed in bulk."""
+        other = create_user(email='other@example.com', password='passs')
+        category = Category.objects.create(
+            user=other,
+            name='dairy',
+            private=False,
+        )
+        self.assertContains(self.client.get(reverse('user_tags')), 'Dairy')
+        client = APIClient()
+        client.force_authenticate(other)
+
+        res = client.patch(
+            reverse('shopping:category-bulk'),
+            [{'id': category.id, 'name': 'milk'}],
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, 200)
+        res = self.client.get(reverse('user_tags'))
+        self.assertContains(res, 'Milk')
+        self.assertNotContains(res, 'Dairy')
+
+    def test_users_cached_separately(self):
+        """Test a user is not shown another user's cached page."""
+        ShopList.objects.create(user=self.user, title='mine')
+        self.client.get(reverse('user_lists'))
+        other = create_user(email='other@example.com', password='passs')
+        self.client.force_login(other)
+
+        res = self.client.get(reverse('user_lists'))
+
+        self.assertNotContains(res, 'mine')
@@ -62,4 +62,5 @@ urlpatterns = [
         name='new_category'
     ),
     path('token/', views.manage_token, name='manage_token'),
+    path('lookup/items/', views.item_lookup, name='item_lookup'),
 ]
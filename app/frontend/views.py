@@ -2,6 +2,8 @@
 Views for HTML pages.
 """
 
+from django.conf import settings
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
 from django.views import generic
 from django.db.models import Q
@@ -16,6 +18,17 @@ from core import models
 
 
 User = get_user_model()
+ITEM_LOOKUP_PAGE_SIZE = 20
+STORE_IMAGES = {
+    'Costco': 'assets/costco.jpg',
+    'Freshco': 'assets/freshco.jpg',
+    'Loblaws': 'assets/loblaws.jpg',
+    'Petsmart': 'assets/petsmart.jpg',
+    'Rcss': 'assets/rcss.jpg',
+    'Safeway': 'assets/safeway.jpg',
+    'Save-On-Foods': 'assets/saveon.jpg',
+    'Walmart': 'assets/walmart.jpg',
+}
 
 
 def index(request):
@@ -33,7 +46,31 @@ class UserCreateView(generic.CreateView):
     template_name = 'signup.html'
 
 
-class UserListsView(LoginRequiredMixin, generic.ListView):
+class CachedFragmentMixin:
+    """Provide the versions keying a page's cached fragments.
+
+    The versions are read from the change log, so a change made through
+    any worker process is shown on the next load. Querysets of the page
+    are only evaluated when a fragment is rendered, so a cached page does
+    not touch the database for them.
+    """
+    shared = False
+
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        context.update({
+            'fragment_timeout': settings.FRAGMENT_CACHE_TTL,
+            'data_version': models.Change.objects.version(
+                self.request.user.pk,
+            ),
+        })
+        if self.shared:
+            context['shared_version'] = models.Change.objects.shared_version()
+        return context
+
+
+class UserListsView(LoginRequiredMixin, CachedFragmentMixin,
+                    generic.ListView):
     model = models.ShopList
     template_name = 'user_lists.html'
     ordering = ['-id']
@@ -51,29 +88,15 @@ class UserListsDetailView(LoginRequiredMixin, generic.DetailView):
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        return queryset.filter(user_id=self.request.user.id)
+        return queryset.filter(user_id=self.request.user.id).with_items()
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
-        default_stores = {
-            'Costco': 'assets/costco.jpg',
-            'Freshco': 'assets/freshco.jpg',
-            'Loblaws': 'assets/loblaws.jpg',
-            'Petsmart': 'assets/petsmart.jpg',
-            'Rcss': 'assets/rcss.jpg',
-            'Safeway': 'assets/safeway.jpg',
-            'Save-On-Foods': 'assets/saveon.jpg',
-            'Walmart': 'assets/walmart.jpg',
-            'None': None,
-            }
-        try:
-            if self.object.items.all()[0].store.name in default_stores:
-                first = self.object.items.all()[0].store.name
-            else:
-                first = 'None'
-        except AttributeError:
-            first = 'None'
-        context.update({'img_url': default_stores[first]})
+        first = next(iter(self.object.items.all()), None)
+        store = first.store if first else None
+        context.update({
+            'img_url': STORE_IMAGES.get(store.name) if store else None,
+        })
         return context
 
 
@@ -88,9 +111,12 @@ class ListCompleteView(LoginRequiredMixin, generic.RedirectView):
             )
 
     def get(self, request, *args, **kwargs):
-        shoplist = models.ShopList.objects.get(id=self.kwargs.get('pk'))
-        shoplist.active = not shoplist.active
-        shoplist.save()
+        active = models.ShopList.objects.toggle_active(
+            request.user,
+            self.kwargs.get('pk'),
+        )
+        if active is None:
+            raise Http404('No list found matching the query')
 
         return super().get(request, *args, **kwargs)
 
@@ -100,15 +126,12 @@ class ListCreateView(LoginRequiredMixin, generic.CreateView):
     template_name = 'new_list.html'
 
     def form_valid(self, form):
-        self.object = form.save(commit=False)
-        self.object.user = self.request.user
-        self.object.save()
+        form.instance.user = self.request.user
         return super().form_valid(form)
 
     def get_form(self, form_class=form_class):
         form = super().get_form(form_class)
-        form.fields['items'].queryset \
-            = form.fields['items'].queryset.filter(user=self.request.user)
+        form.use_items_of(self.request.user)
         return form
 
 
@@ -119,8 +142,7 @@ class ListEditView(LoginRequiredMixin, generic.UpdateView):
 
     def get_form(self, form_class=form_class):
         form = super().get_form(form_class)
-        form.fields['items'].queryset \
-            = form.fields['items'].queryset.filter(user=self.request.user)
+        form.use_items_of(self.request.user)
         return form
 
     def get_queryset(self):
@@ -138,14 +160,17 @@ class DeleteListView(LoginRequiredMixin, generic.DeleteView):
         return queryset.filter(user=self.request.user)
 
 
-class UserItemsView(LoginRequiredMixin, generic.ListView):
+class UserItemsView(LoginRequiredMixin, CachedFragmentMixin,
+                    generic.ListView):
     model = models.Item
     template_name = 'user_items.html'
     ordering = ['name']
+    paginate_by = 60
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        return queryset.filter(user=self.request.user)
+        return queryset.filter(user=self.request.user) \
+                       .select_related('category', 'store')
 
 
 class ItemCreateView(LoginRequiredMixin, generic.CreateView):
@@ -184,28 +209,28 @@ class DeleteItemView(LoginRequiredMixin, generic.DeleteView):
         return queryset.filter(user_id=self.request.user.id)
 
 
-class ItemTagsView(LoginRequiredMixin, generic.ListView):
+class ItemTagsView(LoginRequiredMixin, CachedFragmentMixin,
+                   generic.ListView):
     template_name = 'user_tags.html'
     model = models.Category
-    ordering = ['name']
+    ordering = ['-private', 'name']
+    shared = True
+
+    def visible(self, queryset):
+        """Filter queryset to the user's own and shared tags."""
+        return queryset.filter(
+            Q(user=self.request.user) | Q(private=False)
+        ).order_by(*self.ordering)
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
         context.update({
-            'store_list': models.Store.objects
-                                      .filter(
-                                        Q(user=self.request.user) |
-                                        Q(private=False)
-                                        ).order_by('name')
-                                         .order_by('-private'),
+            'store_list': self.visible(models.Store.objects.all()),
         })
         return context
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        return queryset.filter(
-            Q(user=self.request.user) | Q(private=False)
-        ).order_by('-private')
+        return self.visible(super().get_queryset())
 
 
 class DeleteStoreView(LoginRequiredMixin, generic.DeleteView):
@@ -268,6 +293,30 @@ class CategoryCreateView(LoginRequiredMixin, generic.CreateView):
         return super().form_valid(form)
 
 
+@login_required
+def item_lookup(request):
+    """Return a page of the user's items matching q, or all, as JSON."""
+    page = request.GET.get('page', '')
+    page = int(page) if page.isascii() and page.isdigit() else 1
+    page = max(page, 1)
+    text = request.GET.get('q', '').strip()
+    items = models.Item.objects.filter(user=request.user)
+    items = items.search(text) if text else items.order_by('name')
+    start = (page - 1) * ITEM_LOOKUP_PAGE_SIZE
+    rows = list(
+        items.values_list('id', 'name')[
+            start:start + ITEM_LOOKUP_PAGE_SIZE + 1
+        ]
+    )
+    return JsonResponse({
+        'results': [
+            {'id': pk, 'text': name}
+            for pk, name in rows[:ITEM_LOOKUP_PAGE_SIZE]
+        ],
+        'more': len(rows) > ITEM_LOOKUP_PAGE_SIZE,
+    })
+
+
 @login_required
 def manage_token(request):
     context = {}
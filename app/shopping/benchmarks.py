@@ -0,0 +1,47 @@
+"""
+Timing and seeding helpers shared by the benchmark commands.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from core.models import ShopList, Item
+
+
+def best(run, repeat):
+    """Return the fastest of repeat runs in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+@contextmanager
+def benchmark_user():
+    """Yield a new user whose data is rolled back on exit.
+
+    The email is unique, so a run never clashes with an existing account.
+    """
+    with transaction.atomic():
+        yield get_user_model().objects.create_user(
+            f'benchmark-{uuid.uuid4().hex}@example.com',
+        )
+        transaction.set_rollback(True)
+
+
+def seed_lists(user, num_lists, num_items, **fields):
+    """Create num_lists lists for user, each holding the same num_items."""
+    items = Item.objects.bulk_create([
+        Item(user=user, name=f'item {i}', price=i % 100 + 0.99, **fields)
+        for i in range(num_items)
+    ])
+    for i in range(num_lists):
+        ShopList.objects.create(
+            user=user,
+            title=f'list {i}',
+        ).items.add(*items)
@@ -0,0 +1,66 @@
+"""
+Export of a user's shopping data as flat records.
+"""
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Q
+
+from core.models import (
+    ShopList,
+    Item,
+    Category,
+    Store,
+)
+
+
+FIELDS = ['type', 'id', 'name', 'price', 'category', 'store', 'active',
+          'items']
+
+
+def export_records(user, chunk_size=2000):
+    """Yield records for all of user's categories, stores, items and lists.
+
+    Rows are read through server-side cursors chunk_size at a time, so
+    memory use does not grow with the size of the account. Lists name
+    their items by id.
+    """
+    for kind, model in (('category', Category), ('store', Store)):
+        tags = model.objects.filter(user=user).order_by('id') \
+                            .values_list('id', 'name')
+        for tag_id, name in tags.iterator(chunk_size):
+            yield {'type': kind, 'id': tag_id, 'name': name}
+
+    items = Item.objects.filter(user=user).order_by('id').values_list(
+        'id',
+        'name',
+        'price',
+        'category__name',
+        'store__name',
+    )
+    for item_id, name, price, category, store in items.iterator(chunk_size):
+        yield {
+            'type': 'item',
+            'id': item_id,
+            'name': name,
+            'price': price,
+            'category': category,
+            'store': store,
+        }
+
+    shoplists = ShopList.objects.filter(user=user).order_by('id').annotate(
+        item_ids=ArrayAgg(
+            'items',
+            filter=Q(items__isnull=False),
+            ordering='items',
+            default=None,
+        ),
+    ).values_list('id', 'title', 'total', 'active', 'item_ids')
+    for shoplist_id, title, total, active, item_ids in \
+            shoplists.iterator(chunk_size):
+        yield {
+            'type': 'shoplist',
+            'id': shoplist_id,
+            'name': title or ShopList.default_title(shoplist_id),
+            'price': total,
+            'active': active,
+            'items': item_ids or [],
+        }
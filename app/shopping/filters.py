@@ -0,0 +1,168 @@
+"""
+Filter backends for the shopping list APIs.
+"""
+from decimal import Decimal, InvalidOperation
+
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from core.models import NameField
+
+
+def decimal_param(request, param):
+    """Return query parameter param as a Decimal, or None if absent."""
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        number = None
+    if number is None or not number.is_finite():
+        raise ValidationError({param: 'A valid number is required.'})
+    return number
+
+
+def int_param(request, param, default=None):
+    """Return query parameter param as a non-negative int, or default."""
+    value = request.query_params.get(param)
+    if not value:
+        return default
+    if not (value.isascii() and value.isdigit()):
+        raise ValidationError({param: 'A non-negative integer is required.'})
+    return int(value)
+
+
+def bool_param(request, param):
+    """Return query parameter param as a bool, or None if absent."""
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    if value.lower() not in ('true', 'false', '1', '0'):
+        raise ValidationError({param: 'Must be true or false.'})
+    return value.lower() in ('true', '1')
+
+
+def schema_parameters(params, schema_type):
+    """Return OpenAPI query parameters for (param, _, description) params."""
+    return [
+        {
+            'name': param,
+            'required': False,
+            'in': 'query',
+            'description': description,
+            'schema': {'type': schema_type},
+        }
+        for param, _, description in params
+    ]
+
+
+class DecimalRangeFilter(filters.BaseFilterBackend):
+    """Filter objects by a decimal field lying within a range."""
+    params = []
+
+    def filter_queryset(self, request, queryset, view):
+        for param, lookup, _ in self.params:
+            value = decimal_param(request, param)
+            if value is not None:
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return schema_parameters(self.params, 'number')
+
+
+class TotalRangeFilter(DecimalRangeFilter):
+    """Filter shopping lists by the total price of their items."""
+    params = [
+        ('total_min', 'total__gte', 'Minimum list total.'),
+        ('total_max', 'total__lte', 'Maximum list total.'),
+    ]
+
+
+class PriceRangeFilter(DecimalRangeFilter):
+    """Filter items by price."""
+    params = [
+        ('price_min', 'price__gte', 'Minimum item price.'),
+        ('price_max', 'price__lte', 'Maximum item price.'),
+    ]
+
+
+class ActiveFilter(filters.BaseFilterBackend):
+    """Filter shopping lists by whether they are active."""
+    params = [('active', 'active', 'Only active or inactive lists.')]
+
+    def filter_queryset(self, request, queryset, view):
+        for param, lookup, _ in self.params:
+            value = bool_param(request, param)
+            if value is not None:
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return schema_parameters(self.params, 'boolean')
+
+
+class TagFilter(filters.BaseFilterBackend):
+    """Filter items by the id of their category or store."""
+    params = [
+        ('category', 'category_id', 'Only items in this category.'),
+        ('store', 'store_id', 'Only items from this store.'),
+    ]
+
+    def filter_queryset(self, request, queryset, view):
+        for param, lookup, _ in self.params:
+            value = int_param(request, param)
+            if value is not None:
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return schema_parameters(self.params, 'integer')
+
+
+class NamePrefixFilter(filters.BaseFilterBackend):
+    """Filter objects by the start of their name."""
+    params = [('name', 'name__startswith', 'Only names starting with this.')]
+
+    def filter_queryset(self, request, queryset, view):
+        for param, lookup, _ in self.params:
+            value = request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(
+                    **{lookup: NameField.normalize(value)}
+                )
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return schema_parameters(self.params, 'string')
+
+
+class ExpressionOrderingFilter(filters.OrderingFilter):
+    """Ordering filter sorting some fields by an expression instead.
+
+    The view's ordering_expressions maps such a field to a function that
+    returns the expression. The queryset is annotated with it as
+    sort_<field>, which the ordering, and so cursor positions, then use.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        expressions = getattr(view, 'ordering_expressions', {})
+        if not ordering:
+            return ordering
+        return [
+            term.replace(field, f'sort_{field}')
+            if (field := term.lstrip('-')) in expressions else term
+            for term in ordering
+        ]
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view) or []
+        expressions = getattr(view, 'ordering_expressions', {})
+        queryset = queryset.annotate(**{
+            f'sort_{field}': expression()
+            for field, expression in expressions.items()
+            if f'sort_{field}' in {term.lstrip('-') for term in ordering}
+        })
+        return super().filter_queryset(request, queryset, view)
@@ -0,0 +1,79 @@
+"""
+Bulk import of items with their categories and stores.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers as drf_serializers
+
+from shopping.serializers import ItemSerializer
+
+
+FORMATS = ['csv', 'ndjson']
+
+# Errors raised while reading rows from undecodable or malformed text.
+READ_ERRORS = (UnicodeDecodeError, csv.Error)
+
+
+def _ndjson_rows(lines):
+    """Yield decoded lines, or the line itself if it is not valid JSON."""
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
+
+
+def read_rows(lines, format):
+    """Yield rows read from lines of CSV or NDJSON text.
+
+    Records of an export other than items are skipped, so an export can be
+    imported again.
+    """
+    if format == 'csv':
+        rows = csv.DictReader(lines)
+    else:
+        rows = _ndjson_rows(lines)
+    for row in rows:
+        if not isinstance(row, dict) or row.get('type') in (None, '', 'item'):
+            yield row
+
+
+def _item_data(row):
+    """Return ItemSerializer data for an imported row."""
+    if not isinstance(row, dict):
+        return row
+    data = {'name': row.get('name'), 'price': row.get('price')}
+    for field in ('category', 'store'):
+        if row.get(field):
+            data[field] = {'name': row[field]}
+    return data
+
+
+def import_items(rows, context, chunk_size=1000):
+    """Create or update items for rows, chunk_size rows at a time.
+
+    Rows name an item's category and store, which are created as needed.
+    Each valid chunk is written with set-based queries in one transaction.
+    Returns the number of rows imported and a list of per-row errors,
+    numbered from 1.
+    """
+    items = ItemSerializer(many=True, context=context)
+    imported = 0
+    errors = []
+    rows = enumerate((_item_data(row) for row in rows), 1)
+    while chunk := list(islice(rows, chunk_size)):
+        valid = []
+        for number, data in chunk:
+            try:
+                valid.append(items.child.run_validation(data))
+            except drf_serializers.ValidationError as exc:
+                errors.append({'row': number, 'errors': exc.detail})
+        if valid:
+            with transaction.atomic():
+                items.get_or_create_items(valid, update=True)
+            imported += len(valid)
+    return imported, errors
@@ -0,0 +1,74 @@
+"""
+Django command to benchmark JSON rendering of shopping list payloads.
+"""
+import io
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.models import ShopList
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from shopping.benchmarks import best, benchmark_user, seed_lists
+from shopping.serializers import ShopListSerializer
+
+
+class Command(BaseCommand):
+    """Django command to compare the stock and orjson JSON handling."""
+
+    def add_arguments(self, parser):
+        """Arguments for command line."""
+        parser.add_argument(
+            '--lists',
+            type=int,
+            default=100,
+            help='Number of shopping lists in the payload',
+        )
+        parser.add_argument(
+            '--items',
+            type=int,
+            default=50,
+            help='Number of items per list',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Runs per measurement, the fastest is reported',
+        )
+
+    def payload(self, num_lists, num_items):
+        """Return serialized lists, created in a rolled back transaction."""
+        with benchmark_user() as user:
+            seed_lists(user, num_lists, num_items)
+            data = ShopListSerializer(
+                ShopList.objects.filter(user=user).with_items(),
+                many=True,
+            ).data
+        return data
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        data = self.payload(options['lists'], options['items'])
+        body = JSONRenderer().render(data)
+        self.stdout.write(
+            f'{options["lists"]} lists of {options["items"]} items, '
+            f'{len(body) / 1024:.0f} KiB'
+        )
+        for name, renderer, parser in (
+            ('json', JSONRenderer(), JSONParser()),
+            ('orjson', ORJSONRenderer(), ORJSONParser()),
+        ):
+            render = best(
+                lambda: renderer.render(data),
+                options['repeat'],
+            )
+            parse = best(
+                lambda: parser.parse(io.BytesIO(body)),
+                options['repeat'],
+            )
+            self.stdout.write(
+                f'{name:<8}render {render:>8.2f} ms'
+                f'    parse {parse:>8.2f} ms'
+            )
@@ -0,0 +1,77 @@
+"""
+Django command to benchmark the full and read shopping list serializers.
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import ShopList, Category, Store
+from shopping import serializers
+from shopping.benchmarks import best, benchmark_user, seed_lists
+
+
+class Command(BaseCommand):
+    """Django command to compare serializers on loaded shopping lists."""
+
+    def add_arguments(self, parser):
+        """Arguments for command line."""
+        parser.add_argument(
+            '--lists',
+            type=int,
+            default=100,
+            help='Number of shopping lists',
+        )
+        parser.add_argument(
+            '--items',
+            type=int,
+            default=50,
+            help='Number of items per list',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='Runs per measurement, the fastest is reported',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        with benchmark_user() as user:
+            seed_lists(
+                user,
+                options['lists'],
+                options['items'],
+                category=Category.objects.create(user=user, name='category'),
+                store=Store.objects.create(user=user, name='store'),
+            )
+            shoplists = list(ShopList.objects.filter(user=user).with_items())
+            items = [item for sl in shoplists for item in sl.items.all()]
+
+        self.stdout.write(
+            f'{len(shoplists)} lists holding {len(items)} items'
+        )
+        for label, full, read, objs in (
+            (
+                'lists',
+                serializers.ShopListSerializer,
+                serializers.ShopListReadSerializer,
+                shoplists,
+            ),
+            (
+                'items',
+                serializers.ItemSerializer,
+                serializers.ItemReadSerializer,
+                items,
+            ),
+        ):
+            full_ms = best(
+                lambda: full(objs, many=True).data,
+                options['repeat'],
+            )
+            read_ms = best(
+                lambda: read(objs, many=True).data,
+                options['repeat'],
+            )
+            self.stdout.write(
+                f'{label:<8}full {full_ms:>9.2f} ms'
+                f'    read {read_ms:>9.2f} ms'
+                f'    {full_ms / read_ms:>5.1f}x'
+            )
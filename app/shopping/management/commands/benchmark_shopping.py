@@ -0,0 +1,105 @@
+"""
+Django command to benchmark the shopping list serializers.
+"""
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.models import ShopList
+from shopping.benchmarks import benchmark_user
+from shopping.serializers import ShopListSerializer
+
+
+def item_payload(size, prefix='item', price=2):
+    """Return a nested item payload of the given size."""
+    return [
+        {
+            'name': f'{prefix} {i}',
+            'price': price,
+            'category': {'name': f'category {i % 10}'},
+            'store': {'name': f'store {i % 5}'},
+        }
+        for i in range(size)
+    ]
+
+
+class Command(BaseCommand):
+    """Django command to benchmark shopping list serializers."""
+
+    def add_arguments(self, parser):
+        """Arguments for command line."""
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10, 100, 1000],
+            help='Number of items per list',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per measurement, the fastest is reported',
+        )
+
+    def measure(self, label, setup, run, repeat):
+        """Report the fastest of repeat runs, each rolled back after."""
+        best = None
+        for _ in range(repeat):
+            sid = transaction.savepoint()
+            args = setup()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                run(*args)
+                elapsed = time.perf_counter() - start
+            transaction.savepoint_rollback(sid)
+            if best is None or elapsed < best:
+                best = elapsed
+        self.stdout.write(
+            f'{label:<32}{best * 1000:>10.1f} ms'
+            f'{len(queries):>8} queries'
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        with benchmark_user() as user:
+            context = {'request': SimpleNamespace(user=user)}
+
+            for size in options['sizes']:
+                self.measure(
+                    f'create list, {size} items',
+                    lambda: (),
+                    lambda: self.write(context, None, {
+                        'title': 'benchmark',
+                        'items': item_payload(size),
+                    }),
+                    options['repeat'],
+                )
+                self.measure(
+                    f'update list, {size} items',
+                    lambda: (ShopList.objects.with_items().get(
+                        id=self.write(context, None, {
+                            'title': 'benchmark',
+                            'items': item_payload(size),
+                        }).id,
+                    ),),
+                    lambda shoplist: self.write(context, shoplist, {
+                        'items': item_payload(size // 2, price=3)
+                        + item_payload(size - size // 2, prefix='new'),
+                    }),
+                    options['repeat'],
+                )
+
+    def write(self, context, instance, data):
+        """Validate and save data through ShopListSerializer."""
+        serializer = ShopListSerializer(
+            instance,
+            data=data,
+            partial=instance is not None,
+            context=context,
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(user=context['request'].user)
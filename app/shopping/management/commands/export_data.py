@@ -0,0 +1,56 @@
+"""
+Django command to export a user's shopping data.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from shopping.exports import export_records
+from shopping.renderers import CSVRenderer, NDJSONRenderer
+
+
+RENDERERS = {
+    renderer.format: renderer
+    for renderer in (NDJSONRenderer, CSVRenderer)
+}
+
+
+class Command(BaseCommand):
+    """Django command to stream a user's shopping data as NDJSON or CSV."""
+
+    def add_arguments(self, parser):
+        """Arguments for command line."""
+        parser.add_argument('email', help='Email of the user to export')
+        parser.add_argument(
+            '--format',
+            choices=sorted(RENDERERS),
+            default='ndjson',
+            help='Output format',
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write to instead of standard output',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched from the database at a time',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        try:
+            user = get_user_model().objects.get(email=options['email'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user with email {options["email"]}.')
+
+        chunks = RENDERERS[options['format']]().stream(
+            export_records(user, options['chunk_size']),
+        )
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending='')
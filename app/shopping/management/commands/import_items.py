@@ -0,0 +1,58 @@
+"""
+Django command to import items from a CSV or NDJSON file.
+"""
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from shopping.imports import FORMATS, READ_ERRORS, import_items, read_rows
+
+
+class Command(BaseCommand):
+    """Django command to create or update a user's items in bulk."""
+
+    def add_arguments(self, parser):
+        """Arguments for command line."""
+        parser.add_argument('email', help='Email of the user to import for')
+        parser.add_argument('path', help='CSV or NDJSON file to import')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Input format, by default taken from the file extension',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Rows validated and written at a time',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        try:
+            user = get_user_model().objects.get(email=options['email'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user with email {options["email"]}.')
+
+        path = options['path']
+        format = options['format'] or path.rpartition('.')[2].lower()
+        if format not in FORMATS:
+            raise CommandError(f'Cannot tell the format of {path}.')
+
+        with open(path, newline='', encoding='utf-8') as lines:
+            try:
+                imported, errors = import_items(
+                    read_rows(lines, format),
+                    {'request': SimpleNamespace(user=user)},
+                    options['chunk_size'],
+                )
+            except READ_ERRORS as exc:
+                raise CommandError(
+                    f'Cannot read {path}, chunks before the error were '
+                    f'imported: {exc}'
+                )
+
+        for error in errors:
+            self.stderr.write(f'Row {error["row"]}: {error["errors"]}')
+        self.stdout.write(self.style.SUCCESS(f'Imported {imported} rows.'))
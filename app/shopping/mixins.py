@@ -0,0 +1,211 @@
+"""
+Mixins for the shopping list API views.
+"""
+import hashlib
+from functools import cached_property
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags
+
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core.models import Change
+
+
+class ReadSerializerMixin:
+    """Use read_serializer_class for actions that only read objects."""
+    read_serializer_class = None
+    read_actions = ('list', 'retrieve')
+
+    def get_serializer_class(self):
+        """Return the read serializer for read actions."""
+        if self.action in self.read_actions and self.read_serializer_class:
+            return self.read_serializer_class
+        return super().get_serializer_class()
+
+
+class FieldSelectionMixin(ReadSerializerMixin):
+    """Let read actions select fields with ?fields= and ?expand=.
+
+    fields names the fields to render and expand the relations to render
+    in full, others being given by id. Either one left out selects
+    everything. get_queryset should load only what is_shown and
+    is_expanded report, which read_serializer_class then renders.
+    """
+
+    def _requested(self, param, allowed):
+        """Return the names given in param, or None if not given."""
+        if self.request is None or self.action not in self.read_actions:
+            return None
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        names = {name for name in value.split(',') if name}
+        unknown = sorted(names - set(allowed))
+        if unknown:
+            raise serializers.ValidationError(
+                {param: [f'Unknown field: {name}.' for name in unknown]}
+            )
+        return names
+
+    @cached_property
+    def selected_fields(self):
+        """Return the fields selected with ?fields=, or None."""
+        return self._requested(
+            'fields',
+            self.read_serializer_class.Meta.fields,
+        )
+
+    @cached_property
+    def expanded_fields(self):
+        """Return the relations selected with ?expand=, or None."""
+        return self._requested(
+            'expand',
+            self.read_serializer_class.expandable,
+        )
+
+    def is_shown(self, name):
+        """Return whether the field name is rendered."""
+        return self.selected_fields is None or name in self.selected_fields
+
+    def is_expanded(self, name):
+        """Return whether the relation name is rendered in full."""
+        return self.is_shown(name.split('.')[0]) and (
+            self.expanded_fields is None or name in self.expanded_fields
+        )
+
+    def get_serializer_context(self):
+        """Pass the selected fields and expansions to the serializer."""
+        context = super().get_serializer_context()
+        context['fields'] = self.selected_fields
+        context['expand'] = self.expanded_fields
+        return context
+
+
+class CachedListMixin:
+    """Serve repeated list requests from the cache until the data changes.
+
+    Responses are keyed by the user's data version, their latest change,
+    which moves on every write to their lists, items, categories or
+    stores. Being read from the database, it is the same in every worker.
+    It also gives responses an ETag, so unchanged polls get 304 Not
+    Modified.
+    """
+    cache_timeout = settings.API_CACHE_TTL
+
+    def _request_digest(self, request, version):
+        """Return a digest identifying request's response at version."""
+        return hashlib.sha256(':'.join([
+            str(request.user.pk),
+            str(version),
+            request.accepted_media_type,
+            request.build_absolute_uri(),
+        ]).encode()).hexdigest()
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Return handler's response, from the cache when up to date."""
+        version = Change.objects.version(request.user.pk)
+        digest = self._request_digest(request, version)
+        etag = f'"{digest[:32]}"'
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match:
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={'ETag': etag},
+            )
+
+        key = f'api-response:{digest}'
+        data = cache.get(key)
+        if data is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(key, response.data, self.cache_timeout)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """List objects, reusing a cached response when available."""
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class BulkModelMixin:
+    """Create, update or delete many objects in one request.
+
+    POST, PATCH and DELETE to the collection's bulk/ url take a list of
+    objects, of objects with their ids, or of ids. Each request runs in
+    one transaction and writes nothing unless every object is valid;
+    errors are returned in the order of the objects. Deletes go through
+    the queryset's bulk_delete(), without per-object signals.
+    """
+    bulk_limit = 1000
+
+    def get_bulk_ids(self, ids):
+        """Validate ids and return them, with an error for missing ones."""
+        ids = serializers.ListField(
+            child=serializers.IntegerField(),
+            allow_empty=False,
+            max_length=self.bulk_limit,
+        ).run_validation(ids)
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError('Ids must not repeat.')
+        found = self.get_queryset().filter(id__in=ids).in_bulk()
+        if len(found) != len(ids):
+            raise serializers.ValidationError([
+                {} if pk in found else {'id': ['Not found.']}
+                for pk in ids
+            ])
+        return [found[pk] for pk in ids]
+
+    def perform_bulk_create(self, serializer):
+        """Save the validated objects."""
+        serializer.save()
+
+    @action(methods=['post'], detail=False, url_path='bulk', url_name='bulk')
+    def bulk_create(self, request):
+        """Create many objects, reusing those with the same names."""
+        serializers.ListField(
+            allow_empty=False,
+            max_length=self.bulk_limit,
+        ).run_validation(request.data)
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            self.perform_bulk_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Update many objects given with their ids."""
+        rows = serializers.ListField(
+            child=serializers.DictField(),
+            allow_empty=False,
+            max_length=self.bulk_limit,
+        ).run_validation(request.data)
+        instances = self.get_bulk_ids([row.get('id') for row in rows])
+        serializer = self.get_serializer(
+            instances,
+            data=rows,
+            many=True,
+            partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(serializer.data)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        """Delete many objects given by id with set-based queries."""
+        instances = self.get_bulk_ids(request.data)
+        with transaction.atomic():
+            self.get_queryset().filter(
+                id__in=[obj.id for obj in instances],
+            ).bulk_delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
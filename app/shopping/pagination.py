@@ -0,0 +1,26 @@
+"""
+Pagination classes for the shopping list APIs.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination over objects ordered newest first."""
+    ordering = ['-id']
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        """Add id as a tie-breaker, in the direction of the ordering.
+
+        Ordering both fields the same way lets one index serve a page.
+        """
+        ordering = list(super().get_ordering(request, queryset, view))
+        if not {'id', '-id'} & set(ordering):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
+
+
+class NameCursorPagination(IdCursorPagination):
+    """Keyset pagination over objects ordered by name."""
+    ordering = ['-name', '-id']
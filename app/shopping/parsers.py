@@ -0,0 +1,39 @@
+"""
+Parsers for bulk imports to the shopping list APIs.
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from shopping.imports import READ_ERRORS, read_rows
+
+
+class RowsParser(parsers.BaseParser):
+    """Parser returning the rows of a request body.
+
+    The whole body is read before any row is imported, so a body that
+    cannot be decoded is rejected without importing part of it.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        lines = codecs.iterdecode(stream, encoding)
+        try:
+            return list(read_rows(lines, self.format))
+        except READ_ERRORS as exc:
+            raise ParseError(f'{self.format.upper()} parse error - {exc}')
+
+
+class CSVParser(RowsParser):
+    """Parser for CSV with a header row."""
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONParser(RowsParser):
+    """Parser for one JSON object per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
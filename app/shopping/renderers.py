@@ -0,0 +1,81 @@
+"""
+Renderers for streamed shopping list exports.
+"""
+import abc
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import renderers
+
+from shopping.exports import FIELDS
+
+
+class StreamingRenderer(renderers.BaseRenderer, metaclass=abc.ABCMeta):
+    """Renderer for sequences of records that can also stream them."""
+    chunk_size = 64 * 1024
+
+    def header(self):
+        """Return text written before the first record."""
+        return ''
+
+    @abc.abstractmethod
+    def encode(self, record):
+        """Return record encoded as text."""
+
+    def stream(self, records):
+        """Yield records encoded in chunks of about chunk_size bytes."""
+        chunk = [self.header()]
+        size = len(chunk[0])
+        for record in records:
+            text = self.encode(record)
+            chunk.append(text)
+            size += len(text)
+            if size >= self.chunk_size:
+                yield ''.join(chunk).encode(self.charset)
+                chunk = []
+                size = 0
+        if chunk:
+            yield ''.join(chunk).encode(self.charset)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b''.join(self.stream(data))
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Renderer writing one JSON object per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def encode(self, record):
+        return json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+
+class CSVRenderer(StreamingRenderer):
+    """Renderer writing records as CSV rows, items separated by spaces."""
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.DictWriter(self.buffer, FIELDS)
+
+    def _pop(self):
+        text = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return text
+
+    def header(self):
+        self.writer.writeheader()
+        return self._pop()
+
+    def encode(self, record):
+        if 'items' in record:
+            record = dict(
+                record,
+                items=' '.join(str(item) for item in record['items']),
+            )
+        self.writer.writerow(record)
+        return self._pop()
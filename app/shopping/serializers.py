@@ -1,9 +1,14 @@
 """
 Shopping list app serializers.
 """
+from django.db import IntegrityError, transaction
+from django.db.models import prefetch_related_objects
+
 from rest_framework import serializers
 
 from core.models import (
+    Change,
+    NameField,
     ShopList,
     Item,
     Category,
@@ -11,6 +16,64 @@ from core.models import (
 )
 
 
+def bulk_update_unique(model, objs, fields):
+    """Bulk update objs, reporting clashing names as a validation error."""
+    try:
+        with transaction.atomic():
+            model.objects.bulk_update(objs, fields)
+    except IntegrityError:
+        raise serializers.ValidationError({
+            'name': [f'{model._meta.verbose_name} names must be unique.'],
+        })
+
+
+class NamedListSerializer(serializers.ListSerializer):
+    """Serializer for getting, creating or renaming many tags at once."""
+
+    def create(self, validated_data):
+        """Get or create tags by name in bulk."""
+        model = self.child.Meta.model
+        tags = model.objects.bulk_get_or_create(
+            self.context['request'].user,
+            {tag['name']: {} for tag in validated_data},
+        )
+        return [
+            tags[NameField.normalize(tag['name'])]
+            for tag in validated_data
+        ]
+
+    def update(self, instances, validated_data):
+        """Rename tags in bulk, in the order of validated_data."""
+        model = self.child.Meta.model
+        for tag, data in zip(instances, validated_data):
+            if 'name' in data:
+                tag.name = NameField.normalize(data['name'])
+        bulk_update_unique(model, instances, ['name'])
+        Change.objects.record_many([
+            (
+                model,
+                [(tag.user_id, tag.id) for tag in instances if tag.private],
+                False,
+            ),
+            (
+                model,
+                [
+                    (tag.user_id, tag.id)
+                    for tag in instances if not tag.private
+                ],
+                True,
+            ),
+            (
+                Item,
+                Item.objects.filter(**{
+                    f'{model._meta.model_name}__in': instances,
+                }).values_list('user_id', 'id'),
+                False,
+            ),
+        ])
+        return instances
+
+
 class CatSerializer(serializers.ModelSerializer):
     """Serializer for category items."""
 
@@ -18,6 +81,7 @@ class CatSerializer(serializers.ModelSerializer):
         model = Category
         fields = ['id', 'name']
         read_only_fields = ['id', 'private']
+        list_serializer_class = NamedListSerializer
 
 
 class StoreSerializer(serializers.ModelSerializer):
@@ -27,6 +91,140 @@ class StoreSerializer(serializers.ModelSerializer):
         model = Store
         fields = ['id', 'name']
         read_only_fields = ['id', 'private']
+        list_serializer_class = NamedListSerializer
+
+
+class ItemListSerializer(serializers.ListSerializer):
+    """Serializer for getting or creating many items at once."""
+
+    def _get_or_create_tags(self, model, validated_data, field):
+        """Get or create the tags named by field in validated_data."""
+        auth_user = self.context['request'].user
+        return model.objects.bulk_get_or_create(auth_user, {
+            item[field]['name']: {}
+            for item in validated_data if item.get(field)
+        })
+
+    def _refresh_lists(self, repriced):
+        """Refresh and log the counters of lists holding repriced items."""
+        if repriced:
+            lists = ShopList.objects.filter(items__in=repriced)
+            lists.refresh_counters()
+            Change.objects.record(
+                ShopList,
+                lists.values_list('user_id', 'id'),
+            )
+
+    def get_or_create_items(self, validated_data, update=False):
+        """Return items for validated_data, creating missing ones in bulk.
+
+        With update, existing items also take the price, category and store
+        given for them, written with a single bulk update.
+        """
+        auth_user = self.context['request'].user
+        categories = self._get_or_create_tags(
+            Category,
+            validated_data,
+            'category',
+        )
+        stores = self._get_or_create_tags(Store, validated_data, 'store')
+
+        values = {}
+        for item in validated_data:
+            fields = {'price': item['price']}
+            if item.get('category'):
+                fields['category_id'] = categories[
+                    NameField.normalize(item['category']['name'])
+                ].id
+            if item.get('store'):
+                fields['store_id'] = stores[
+                    NameField.normalize(item['store']['name'])
+                ].id
+            values[NameField.normalize(item['name'])] = fields
+        items = Item.objects.bulk_get_or_create(auth_user, values)
+
+        if update:
+            changed = []
+            repriced = []
+            for name, fields in values.items():
+                item = items[name]
+                if item.price != fields['price']:
+                    repriced.append(item)
+                if any(getattr(item, f) != v for f, v in fields.items()):
+                    for field, value in fields.items():
+                        setattr(item, field, value)
+                    changed.append(item)
+            if changed:
+                Item.objects.bulk_update(
+                    changed,
+                    ['price', 'category', 'store'],
+                )
+                Change.objects.record(
+                    Item,
+                    [(item.user_id, item.id) for item in changed],
+                )
+            self._refresh_lists(repriced)
+
+        return [
+            items[NameField.normalize(item['name'])]
+            for item in validated_data
+        ]
+
+    def create(self, validated_data):
+        """Get or create items along with their categories and stores."""
+        return self.get_or_create_items(validated_data)
+
+    def to_representation(self, data):
+        """Load categories and stores in bulk unless already selected."""
+        if isinstance(data, list) and data:
+            related = [
+                name for name in self.child.related()
+                if not getattr(Item, name).is_cached(data[0])
+            ]
+            if related:
+                prefetch_related_objects(data, *related)
+        return super().to_representation(data)
+
+    def update(self, instances, validated_data):
+        """Update items in bulk, in the order of validated_data.
+
+        Unlike a single item update, replaced categories and stores are
+        kept, as other items may still use them.
+        """
+        categories = self._get_or_create_tags(
+            Category,
+            validated_data,
+            'category',
+        )
+        stores = self._get_or_create_tags(Store, validated_data, 'store')
+
+        fields = set()
+        repriced = []
+        for item, data in zip(instances, validated_data):
+            if 'price' in data and data['price'] != item.price:
+                repriced.append(item)
+            if 'name' in data:
+                data['name'] = NameField.normalize(data['name'])
+            if data.get('category'):
+                data['category'] = categories[
+                    NameField.normalize(data['category']['name'])
+                ]
+            if data.get('store'):
+                data['store'] = stores[
+                    NameField.normalize(data['store']['name'])
+                ]
+            for attr, value in data.items():
+                setattr(item, attr, value)
+                fields.add(attr)
+
+        if fields:
+            bulk_update_unique(Item, instances, fields)
+            Change.objects.record(
+                Item,
+                [(item.user_id, item.id) for item in instances],
+            )
+            self._refresh_lists(repriced)
+        return instances
 
 
 class ItemSerializer(serializers.ModelSerializer):
@@ -38,6 +236,11 @@ class ItemSerializer(serializers.ModelSerializer):
         model = Item
         fields = ['id', 'name', 'price', 'category', 'store']
         read_only_fields = ['id']
+        list_serializer_class = ItemListSerializer
+
+    def related(self):
+        """Return the relations rendered along with items."""
+        return ('category', 'store')
 
     def _get_or_create_category(self, category, instance):
         auth_user = self.context['request'].user
@@ -88,60 +291,275 @@ class ItemSerializer(serializers.ModelSerializer):
         return instance
 
 
+class ShopListListSerializer(serializers.ListSerializer):
+    """Serializer creating many shopping lists."""
+
+    def create(self, validated_data):
+        """Create lists in one statement and add their items in bulk."""
+        items = [attrs.pop('items', []) for attrs in validated_data]
+        with transaction.atomic():
+            lists = ShopList.objects.bulk_create(
+                [ShopList(**attrs) for attrs in validated_data],
+            )
+            list_items = [
+                (sl.id, item) for sl, sl_items in zip(lists, items)
+                for item in sl_items
+            ]
+            if list_items:
+                created = self.child.fields['items'].get_or_create_items(
+                    [item for _, item in list_items],
+                    update=True,
+                )
+                memberships = {
+                    (shoplist_id, item.id)
+                    for (shoplist_id, _), item in zip(list_items, created)
+                }
+                ShopList.items.through.objects.bulk_create([
+                    ShopList.items.through(shoplist_id=sl_id, item_id=it_id)
+                    for sl_id, it_id in memberships
+                ])
+                ShopList.objects.filter(
+                    id__in={shoplist_id for shoplist_id, _ in memberships},
+                ).refresh_counters()
+            Change.objects.record(
+                ShopList,
+                [(sl.user_id, sl.id) for sl in lists],
+            )
+        return list(
+            ShopList.objects.filter(id__in=[sl.id for sl in lists])
+                            .order_by('id')
+                            .with_items()
+        )
+
+    def to_representation(self, data):
+        """Load the items of all lists in bulk unless already loaded."""
+        if isinstance(data, list):
+            self.child.prefetch_items(data)
+        return super().to_representation(data)
+
+
 class ShopListSerializer(serializers.ModelSerializer):
     """Serializer for shopping lists."""
     items = ItemSerializer(many=True, required=False)
+    total = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        coerce_to_string=False,
+        read_only=True,
+    )
 
     class Meta:
         model = ShopList
-        fields = ['id', 'title', 'items', 'total', 'active']
-        read_only_fields = ['id']
+        fields = ['id', 'title', 'items', 'total', 'item_count', 'active']
+        read_only_fields = ['id', 'item_count']
+        list_serializer_class = ShopListListSerializer
 
-    def _get_or_create_items(self, items, instance):
-        auth_user = self.context['request'].user
-        for item in items:
-            category = item.pop('category', None)
-            store = item.pop('store', None)
-            item_obj, created = Item.objects.get_or_create(
-                user=auth_user,
-                **item,
-            )
-            if category is not None:
-                if item_obj.category:
-                    item_obj.category.delete()
-                cat_obj, created = Category.objects.get_or_create(
-                    user=auth_user,
-                    **category,
-                )
-                item_obj.category = cat_obj
-            if store is not None:
-                if item_obj.store:
-                    item_obj.store.delete()
-                store_obj, created = Store.objects.get_or_create(
-                    user=auth_user,
-                    **store,
-                )
-                item_obj.store = store_obj
-            item_obj.save()
-            instance.items.add(item_obj)
+    def item_prefetch(self):
+        """Return the prefetch loading items as they are shown, or None."""
+        return ShopList.item_prefetch()
+
+    def prefetch_items(self, shoplists):
+        """Load the items of shoplists in bulk unless already loaded."""
+        prefetch = self.item_prefetch()
+        missing = [
+            sl for sl in shoplists
+            if 'items' not in getattr(sl, '_prefetched_objects_cache', {})
+        ]
+        if prefetch is not None and missing:
+            prefetch_related_objects(missing, prefetch)
+
+    def to_representation(self, instance):
+        """Load items in bulk unless they were prefetched already."""
+        self.prefetch_items([instance])
+        return super().to_representation(instance)
+
+    def _get_or_create_items(self, items):
+        """Get or create items, updating those that already exist."""
+        return self.fields['items'].get_or_create_items(items, update=True)
 
     def create(self, validated_data):
         """Create a shopping list."""
         items = validated_data.pop('items', [])
-        sl = ShopList.objects.create(**validated_data)
-        self._get_or_create_items(items, sl)
+        with transaction.atomic():
+            sl = ShopList.objects.create(**validated_data)
+            if items:
+                sl.items.add(*self._get_or_create_items(items))
 
         return sl
 
     def update(self, instance, validated_data):
         """Update shopping list."""
         items = validated_data.pop('items', None)
-        if items is not None:
-            instance.items.clear()
-            self._get_or_create_items(items, instance)
+        with transaction.atomic():
+            if items is not None:
+                wanted = {item.id for item in self._get_or_create_items(items)}
+                current = {item.id for item in instance.items.all()}
+                instance.items.remove(*(current - wanted))
+                instance.items.add(*(wanted - current))
+                instance.refresh_from_db(fields=ShopList.COUNTER_FIELDS)
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
 
-        instance.save()
+            instance.save()
         return instance
+
+
+def tag_representation(tag):
+    """Return the representation of a category or store, or None."""
+    if tag is None:
+        return None
+    return {'id': tag.id, 'name': tag.name}
+
+
+class CatReadSerializer(CatSerializer):
+    """Serializer reading categories without per-field overhead."""
+
+    def to_representation(self, instance):
+        return tag_representation(instance)
+
+
+class StoreReadSerializer(StoreSerializer):
+    """Serializer reading stores without per-field overhead."""
+
+    def to_representation(self, instance):
+        return tag_representation(instance)
+
+
+class SelectedFieldsMixin:
+    """Render only the fields and expansions selected in the context.
+
+    The context's fields and expand sets come from ?fields= and ?expand=,
+    with None selecting everything. Relations that are not expanded are
+    rendered as ids. Nested serializers name their relations with an
+    expand_prefix, such as items.category, and always render all fields.
+    """
+    expandable = ()
+
+    def __init__(self, *args, expand_prefix='', **kwargs):
+        self.expand_prefix = expand_prefix
+        super().__init__(*args, **kwargs)
+
+    def is_selected(self, name):
+        """Return whether the field name is rendered."""
+        fields = self.context.get('fields')
+        return fields is None or bool(self.expand_prefix) or name in fields
+
+    def is_expanded(self, name):
+        """Return whether the relation name is rendered in full."""
+        expand = self.context.get('expand')
+        return expand is None or self.expand_prefix + name in expand
+
+    def select_fields(self, data):
+        """Return data without the fields that were not selected."""
+        return {
+            name: value for name, value in data.items()
+            if self.is_selected(name)
+        }
+
+
+class ItemReadSerializer(SelectedFieldsMixin, ItemSerializer):
+    """Serializer reading items without per-field overhead."""
+    expandable = ('category', 'store')
+
+    def to_representation(self, instance):
+        return self.select_fields({
+            'id': instance.id,
+            'name': instance.name,
+            'price': self.fields['price'].to_representation(instance.price),
+            'category': self.tag(instance, 'category'),
+            'store': self.tag(instance, 'store'),
+        })
+
+    def tag(self, instance, name):
+        """Return the category or store of instance, or its id."""
+        if self.is_expanded(name):
+            return tag_representation(getattr(instance, name))
+        return getattr(instance, f'{name}_id')
+
+    def related(self):
+        """Return the expanded relations rendered along with items."""
+        return tuple(
+            name for name in self.expandable if self.is_expanded(name)
+        )
+
+
+class ShopListReadSerializer(SelectedFieldsMixin, ShopListSerializer):
+    """Serializer reading shopping lists without per-field overhead."""
+    expandable = ('items', 'items.category', 'items.store')
+    items = ItemReadSerializer(
+        many=True,
+        required=False,
+        expand_prefix='items.',
+    )
+
+    def to_representation(self, instance):
+        data = {'id': instance.id, 'title': instance.title}
+        if self.is_selected('items'):
+            data['items'] = self.items_representation(instance)
+        data.update({
+            'total': self.fields['total'].to_representation(instance.total),
+            'item_count': instance.item_count,
+            'active': instance.active,
+        })
+        return self.select_fields(data)
+
+    def item_prefetch(self):
+        """Return the prefetch loading items as they are shown, or None."""
+        if not self.is_selected('items'):
+            return None
+        if not self.is_expanded('items'):
+            return ShopList.item_prefetch(related=())
+        return ShopList.item_prefetch(self.fields['items'].child.related())
+
+    def items_representation(self, instance):
+        """Return a list's items, or their ids if items are not expanded."""
+        item = self.fields['items'].child
+        self.prefetch_items([instance])
+        if not self.is_expanded('items'):
+            return [obj.id for obj in instance.items.all()]
+        return [item.to_representation(obj) for obj in instance.items.all()]
+
+
+class ShopListToggleSerializer(serializers.Serializer):
+    """Serializer for the active flag of a toggled shopping list."""
+    id = serializers.IntegerField()
+    active = serializers.BooleanField()
+
+
+class SyncDeletedSerializer(serializers.Serializer):
+    """Serializer for ids of objects deleted since a sync cursor."""
+    lists = serializers.ListField(child=serializers.IntegerField())
+    items = serializers.ListField(child=serializers.IntegerField())
+    categories = serializers.ListField(child=serializers.IntegerField())
+    stores = serializers.ListField(child=serializers.IntegerField())
+
+
+class SyncSerializer(serializers.Serializer):
+    """Serializer for changes since a sync cursor."""
+    cursor = serializers.IntegerField()
+    more = serializers.BooleanField()
+    lists = ShopListReadSerializer(many=True)
+    items = ItemReadSerializer(many=True)
+    categories = CatReadSerializer(many=True)
+    stores = StoreReadSerializer(many=True)
+    deleted = SyncDeletedSerializer()
+
+
+class AutocompleteSerializer(serializers.Serializer):
+    """Serializer for the best matches of a search."""
+    items = ItemReadSerializer(many=True)
+    categories = CatReadSerializer(many=True)
+    stores = StoreReadSerializer(many=True)
+
+
+class ImportErrorSerializer(serializers.Serializer):
+    """Serializer for the errors of an imported row."""
+    row = serializers.IntegerField()
+    errors = serializers.JSONField()
+
+
+class ImportResultSerializer(serializers.Serializer):
+    """Serializer for the outcome of a bulk import."""
+    imported = serializers.IntegerField()
+    errors = ImportErrorSerializer(many=True)
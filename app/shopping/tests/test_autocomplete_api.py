@@ -0,0 +1,97 @@
+"""
+Tests for the autocomplete API.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Item,
+    Category,
+    Store,
+)
+
+
+AUTOCOMPLETE_URL = reverse('shopping:autocomplete')
+
+
+def create_user(**params):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class AutocompleteApiTests(TestCase):
+    """Test completing item, category and store names."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_authenticate(self.user)
+
+    def names(self, res, key):
+        """Return the names of the matches of one kind."""
+        return [obj['name'] for obj in res.data[key]]
+
+    def test_auth_required(self):
+        """Test authentication is required."""
+        res = APIClient().get(AUTOCOMPLETE_URL, {'q': 'milk'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_matches_word_prefixes(self):
+        """Test names match when each word starts a word of the name."""
+        for name in ['dark chocolate', 'chocolate milk', 'milk', 'bread']:
+            Item.objects.create(user=self.user, name=name, price=1)
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'choc'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.names(res, 'items'),
+            ['Chocolate Milk', 'Dark Chocolate'],
+        )
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'MIL choc'})
+
+        self.assertEqual(self.names(res, 'items'), ['Chocolate Milk'])
+
+    def test_tags_and_users(self):
+        """Test own and shared tags match, but not others' items."""
+        other = create_user(email='other@example.com', password='passs')
+        Item.objects.create(user=other, name='coffee', price=1)
+        Category.objects.create(user=self.user, name='coffee beans')
+        Category.objects.create(user=other, name='cocoa')
+        Store.objects.create(user=other, name='coffee shop', private=False)
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'co'})
+
+        self.assertEqual(self.names(res, 'items'), [])
+        self.assertEqual(self.names(res, 'categories'), ['Coffee Beans'])
+        self.assertEqual(self.names(res, 'stores'), ['Coffee Shop'])
+
+    def test_limit(self):
+        """Test the number of matches can be limited."""
+        for i in range(5):
+            Item.objects.create(user=self.user, name=f'tea {i}', price=1)
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'tea', 'limit': 2})
+
+        self.assertEqual(len(res.data['items']), 2)
+
+    def test_invalid_limit(self):
+        """Test a limit that is not an ASCII integer returns an error."""
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'tea', 'limit': '²'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_punctuation_only(self):
+        """Test queries without words match nothing."""
+        Item.objects.create(user=self.user, name='tea', price=1)
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': "&|!:*'"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['items'], [])
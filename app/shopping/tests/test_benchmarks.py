@@ -0,0 +1,29 @@
+"""
+Tests for the benchmark commands.
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import ShopList
+
+
+class BenchmarkCommandTests(TestCase):
+    """Test the benchmark commands run and leave no data behind."""
+
+    def test_commands_run_alongside_existing_account(self):
+        """Test commands do not clash with a benchmark account."""
+        user = get_user_model().objects.create_user('benchmark@example.com')
+        for name, args in (
+            ('benchmark_json', ['--lists', '2', '--items', '3']),
+            ('benchmark_serializers', ['--lists', '2', '--items', '3']),
+            ('benchmark_shopping', ['--sizes', '2']),
+        ):
+            out = StringIO()
+            call_command(name, *args, '--repeat', '1', stdout=out)
+            self.assertIn('ms', out.getvalue())
+
+        self.assertEqual(list(get_user_model().objects.all()), [user])
+        self.assertFalse(ShopList.objects.exists())
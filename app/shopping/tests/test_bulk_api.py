@@ -0,0 +1,310 @@
+"""
+Tests for the bulk list, item, category and store APIs.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Change,
+    ShopList,
+    Item,
+    Category,
+    Store,
+)
+
+
+LIST_BULK_URL = reverse('shopping:shoplist-bulk')
+ITEM_BULK_URL = reverse('shopping:item-bulk')
+CAT_BULK_URL = reverse('shopping:category-bulk')
+STORE_BULK_URL = reverse('shopping:store-bulk')
+
+
+def create_user(email):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email, 'pass123')
+
+
+def item_payload(size, prefix='item', price=2):
+    """Return a list of new items."""
+    return [
+        {
+            'name': f'{prefix} {i}',
+            'price': price,
+            'category': {'name': f'category {i % 3}'},
+            'store': {'name': 'corner'},
+        }
+        for i in range(size)
+    ]
+
+
+class BulkItemApiTests(TestCase):
+    """Test creating, updating and deleting items in bulk."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user('user@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_items(self):
+        """Test creating many items in one request."""
+        res = self.client.post(ITEM_BULK_URL, item_payload(3), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [item['name'] for item in res.data],
+            ['Item 0', 'Item 1', 'Item 2'],
+        )
+        self.assertEqual(Item.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(Category.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(Store.objects.filter(user=self.user).count(), 1)
+
+    def test_bulk_create_invalid(self):
+        """Test an invalid item fails the batch with per-item errors."""
+        payload = item_payload(2)
+        payload[1]['price'] = 'cheap'
+
+        res = self.client.post(ITEM_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('price', res.data[1])
+        self.assertFalse(Item.objects.filter(user=self.user).exists())
+
+    def test_bulk_create_limit(self):
+        """Test batches larger than the limit are rejected."""
+        res = self.client.post(
+            ITEM_BULK_URL,
+            item_payload(1001),
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_items(self):
+        """Test updating many items and the totals of their lists."""
+        milk = Item.objects.create(user=self.user, name='Milk', price=2)
+        eggs = Item.objects.create(user=self.user, name='Eggs', price=3)
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        sl.items.add(milk, eggs)
+
+        res = self.client.patch(ITEM_BULK_URL, [
+            {'id': milk.id, 'price': '2.50', 'category': {'name': 'dairy'}},
+            {'id': eggs.id, 'name': 'free range eggs'},
+        ], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[1]['name'], 'Free Range Eggs')
+        milk.refresh_from_db()
+        eggs.refresh_from_db()
+        sl.refresh_from_db()
+        self.assertEqual(milk.price, Decimal('2.50'))
+        self.assertEqual(milk.category.name, 'Dairy')
+        self.assertEqual(eggs.name, 'Free Range Eggs')
+        self.assertEqual(eggs.price, Decimal('3.00'))
+        self.assertEqual(sl.total, Decimal('5.50'))
+
+    def test_bulk_update_missing(self):
+        """Test unknown or other users' ids are reported per item."""
+        milk = Item.objects.create(user=self.user, name='Milk', price=2)
+        other = Item.objects.create(
+            user=create_user('other@example.com'),
+            name='Milk',
+            price=2,
+        )
+
+        res = self.client.patch(ITEM_BULK_URL, [
+            {'id': milk.id, 'price': 5},
+            {'id': other.id, 'price': 5},
+        ], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data, [{}, {'id': ['Not found.']}])
+        milk.refresh_from_db()
+        self.assertEqual(milk.price, Decimal('2.00'))
+
+    def test_bulk_update_name_clash(self):
+        """Test renaming items to an existing name fails the batch."""
+        milk = Item.objects.create(user=self.user, name='Milk', price=2)
+        Item.objects.create(user=self.user, name='Eggs', price=3)
+
+        res = self.client.patch(
+            ITEM_BULK_URL,
+            [{'id': milk.id, 'name': 'eggs', 'price': 9}],
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        milk.refresh_from_db()
+        self.assertEqual(milk.price, Decimal('2.00'))
+
+    def test_bulk_delete_items(self):
+        """Test deleting many items updates the lists holding them."""
+        milk = Item.objects.create(user=self.user, name='Milk', price=2)
+        eggs = Item.objects.create(user=self.user, name='Eggs', price=3)
+        tea = Item.objects.create(user=self.user, name='Tea', price=4)
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        sl.items.add(milk, eggs, tea)
+
+        res = self.client.delete(
+            ITEM_BULK_URL,
+            [milk.id, eggs.id],
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(list(Item.objects.filter(user=self.user)), [tea])
+        sl.refresh_from_db()
+        self.assertEqual((sl.total, sl.item_count), (Decimal('4.00'), 1))
+
+    def test_bulk_delete_invalid(self):
+        """Test deletion needs a list of the user's own ids."""
+        milk = Item.objects.create(user=self.user, name='Milk', price=2)
+
+        for payload in ([], [milk.id, milk.id], [milk.id, 0], {'id': 1}):
+            with self.subTest(payload=payload):
+                res = self.client.delete(
+                    ITEM_BULK_URL,
+                    payload,
+                    format='json',
+                )
+
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_400_BAD_REQUEST,
+                )
+        self.assertTrue(Item.objects.filter(id=milk.id).exists())
+
+
+class BulkTagApiTests(TestCase):
+    """Test creating, renaming and deleting categories and stores."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user('user@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_tags(self):
+        """Test categories and stores can be managed in bulk."""
+        for model, url in ((Category, CAT_BULK_URL), (Store, STORE_BULK_URL)):
+            with self.subTest(model=model.__name__):
+                res = self.client.post(
+                    url,
+                    [{'name': 'one'}, {'name': 'two'}, {'name': 'one'}],
+                    format='json',
+                )
+                self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+                self.assertEqual(res.data[0]['id'], res.data[2]['id'])
+                one, two = res.data[0]['id'], res.data[1]['id']
+
+                res = self.client.patch(
+                    url,
+                    [{'id': one, 'name': 'first'}],
+                    format='json',
+                )
+                self.assertEqual(res.data, [{'id': one, 'name': 'First'}])
+
+                res = self.client.patch(
+                    url,
+                    [{'id': one, 'name': 'two'}],
+                    format='json',
+                )
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_400_BAD_REQUEST,
+                )
+
+                res = self.client.delete(url, [one, two], format='json')
+                self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+                self.assertFalse(model.objects.filter(user=self.user))
+
+
+class BulkShopListApiTests(TestCase):
+    """Test creating, updating and deleting shopping lists in bulk."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user('user@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_untitled(self):
+        """Test untitled lists are created with their default titles."""
+        res = self.client.post(LIST_BULK_URL, [{}, {}, {}], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        lists = ShopList.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            [sl['title'] for sl in res.data],
+            [f'ShopList{sl.id}' for sl in lists],
+        )
+        self.assertEqual(
+            set(lists.values_list('title', flat=True)),
+            {''},
+        )
+
+    def test_bulk_create_with_items(self):
+        """Test lists are created with new and existing items."""
+        Item.objects.create(user=self.user, name='item 0', price=5)
+        payload = [
+            {'title': 'one', 'items': item_payload(2)},
+            {'title': 'two', 'items': item_payload(1), 'active': False},
+        ]
+
+        res = self.client.post(LIST_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        one, two = res.data
+        self.assertEqual(
+            {item['name'] for item in one['items']},
+            {'Item 0', 'Item 1'},
+        )
+        self.assertEqual((one['total'], one['item_count']), (Decimal(4), 2))
+        self.assertEqual((two['total'], two['active']), (Decimal(2), False))
+        self.assertEqual(
+            ShopList.objects.get(id=one['id']).total,
+            Decimal('4.00'),
+        )
+
+    def test_bulk_update_not_allowed(self):
+        """Test lists cannot be updated in bulk."""
+        sl = ShopList.objects.create(user=self.user, title='one')
+
+        res = self.client.patch(
+            LIST_BULK_URL,
+            [{'id': sl.id, 'title': 'two'}],
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_bulk_delete(self):
+        """Test lists are deleted in bulk, keeping their items."""
+        lists = [
+            ShopList.objects.create(user=self.user, title=title)
+            for title in ('one', 'two')
+        ]
+        lists[0].items.add(
+            Item.objects.create(user=self.user, name='milk', price=1),
+        )
+
+        res = self.client.delete(
+            LIST_BULK_URL,
+            [sl.id for sl in lists],
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(ShopList.objects.exists())
+        self.assertTrue(Item.objects.filter(name='Milk').exists())
+        self.assertEqual(
+            set(
+                Change.objects.filter(kind='shoplist')
+                              .values_list('object_id', flat=True)
+            ),
+            {sl.id for sl in lists},
+        )
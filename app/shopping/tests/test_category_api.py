@@ -57,7 +57,7 @@ class PrivateCategoryAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         cats = Category.objects.filter(user=self.user).order_by('-name')
         serializer = CatSerializer(cats, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_private_is_true(self):
         """Test private must be set to True."""
@@ -0,0 +1,152 @@
+"""
+Tests for exporting shopping data.
+"""
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    ShopList,
+    Item,
+    Category,
+    Store,
+)
+
+
+EXPORT_URL = reverse('shopping:export')
+
+
+def create_user(email):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email, 'pass123')
+
+
+class ExportTestMixin:
+    """Create a user with some shopping data to export."""
+
+    def setUp(self):
+        self.user = create_user('user@example.com')
+        self.category = Category.objects.create(user=self.user, name='Dairy')
+        self.store = Store.objects.create(user=self.user, name='Corner')
+        self.milk = Item.objects.create(
+            user=self.user,
+            name='Milk',
+            price=Decimal('2.50'),
+            category=self.category,
+            store=self.store,
+        )
+        self.eggs = Item.objects.create(user=self.user, name='Eggs', price=3)
+        self.sl = ShopList.objects.create(user=self.user, title='Groceries')
+        self.sl.items.add(self.milk, self.eggs)
+        self.empty = ShopList.objects.create(user=self.user, title='Empty')
+        other = create_user('other@example.com')
+        ShopList.objects.create(user=other, title='Not mine')
+
+
+class ExportApiTests(ExportTestMixin, TestCase):
+    """Test the export API."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_authentication_required(self):
+        """Test authentication is required and reported as JSON."""
+        res = APIClient().get(EXPORT_URL, {'format': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['Content-Type'], 'application/json')
+
+    def test_export_ndjson(self):
+        """Test exporting all of a user's data as NDJSON."""
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        records = [
+            json.loads(line)
+            for line in b''.join(res.streaming_content).splitlines()
+        ]
+        self.assertEqual(records, [
+            {'type': 'category', 'id': self.category.id, 'name': 'Dairy'},
+            {'type': 'store', 'id': self.store.id, 'name': 'Corner'},
+            {
+                'type': 'item',
+                'id': self.milk.id,
+                'name': 'Milk',
+                'price': '2.50',
+                'category': 'Dairy',
+                'store': 'Corner',
+            },
+            {
+                'type': 'item',
+                'id': self.eggs.id,
+                'name': 'Eggs',
+                'price': '3.00',
+                'category': None,
+                'store': None,
+            },
+            {
+                'type': 'shoplist',
+                'id': self.sl.id,
+                'name': 'Groceries',
+                'price': '5.50',
+                'active': True,
+                'items': [self.milk.id, self.eggs.id],
+            },
+            {
+                'type': 'shoplist',
+                'id': self.empty.id,
+                'name': 'Empty',
+                'price': '0.00',
+                'active': True,
+                'items': [],
+            },
+        ])
+
+    def test_export_csv(self):
+        """Test exporting as CSV by Accept header."""
+        res = self.client.get(EXPORT_URL, HTTP_ACCEPT='text/csv')
+
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertIn('shopping.csv', res['Content-Disposition'])
+        rows = list(csv.DictReader(
+            io.StringIO(b''.join(res.streaming_content).decode()),
+        ))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[2]['category'], 'Dairy')
+        self.assertEqual(rows[4]['items'], f'{self.milk.id} {self.eggs.id}')
+        self.assertEqual(rows[5]['items'], '')
+
+
+class ExportCommandTests(ExportTestMixin, TestCase):
+    """Test the export_data command."""
+
+    def test_export_to_stdout(self):
+        """Test records are written to standard output in small chunks."""
+        out = io.StringIO()
+
+        call_command(
+            'export_data',
+            'user@example.com',
+            '--format=csv',
+            '--chunk-size=1',
+            stdout=out,
+        )
+
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(
+            [row['type'] for row in rows],
+            ['category', 'store', 'item', 'item', 'shoplist', 'shoplist'],
+        )
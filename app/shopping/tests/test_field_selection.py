@@ -0,0 +1,135 @@
+"""
+Tests for selecting fields with ?fields= and ?expand=.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    ShopList,
+    Item,
+    Category,
+    Store,
+)
+
+
+LIST_URL = reverse('shopping:shoplist-list')
+ITEM_URL = reverse('shopping:item-list')
+
+
+def detail_url(shoplist_id):
+    """Return shopping list detail url."""
+    return reverse('shopping:shoplist-detail', args=[shoplist_id])
+
+
+def create_user(**params):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class FieldSelectionTests(TestCase):
+    """Test fields and expansions selected on shopping endpoints."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(user=self.user, name='Dairy')
+        self.store = Store.objects.create(user=self.user, name='Corner')
+        self.item = Item.objects.create(
+            user=self.user,
+            name='Milk',
+            price=2,
+            category=self.category,
+            store=self.store,
+        )
+        self.shoplist = ShopList.objects.create(
+            user=self.user,
+            title='Groceries',
+        )
+        self.shoplist.items.add(self.item)
+
+    def test_default_returns_everything(self):
+        """Test lists render all fields and relations by default."""
+        res = self.client.get(detail_url(self.shoplist.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(res.data),
+            ['id', 'title', 'items', 'total', 'item_count', 'active'],
+        )
+        self.assertEqual(
+            res.data['items'][0]['category'],
+            {'id': self.category.id, 'name': 'Dairy'},
+        )
+
+    def test_list_fields(self):
+        """Test only the requested fields of lists are returned."""
+        res = self.client.get(LIST_URL, {'fields': 'id,title'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'],
+            [{'id': self.shoplist.id, 'title': 'Groceries'}],
+        )
+
+    def test_list_items_as_ids(self):
+        """Test items not expanded are returned as ids."""
+        res = self.client.get(
+            detail_url(self.shoplist.id),
+            {'fields': 'items', 'expand': ''},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'items': [self.item.id]})
+
+    def test_expand_nested_relation(self):
+        """Test nested relations are expanded only when named."""
+        res = self.client.get(
+            detail_url(self.shoplist.id),
+            {'expand': 'items,items.store'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        item = res.data['items'][0]
+        self.assertEqual(item['category'], self.category.id)
+        self.assertEqual(
+            item['store'],
+            {'id': self.store.id, 'name': 'Corner'},
+        )
+
+    def test_item_fields(self):
+        """Test items can be listed with some fields and tag ids."""
+        res = self.client.get(
+            ITEM_URL,
+            {'fields': 'name,category', 'expand': ''},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'],
+            [{'name': 'Milk', 'category': self.category.id}],
+        )
+
+    def test_unknown_field(self):
+        """Test unknown fields and expansions are rejected."""
+        for params in ({'fields': 'id,owner'}, {'expand': 'user'}):
+            with self.subTest(params=params):
+                res = self.client.get(LIST_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(next(iter(params)), res.data)
+
+    def test_cached_per_selection(self):
+        """Test cached responses are kept apart for each selection."""
+        full = self.client.get(LIST_URL)
+        sparse = self.client.get(LIST_URL, {'fields': 'id'})
+
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+        self.assertEqual(
+            sparse.data['results'],
+            [{'id': self.shoplist.id}],
+        )
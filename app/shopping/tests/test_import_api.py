@@ -0,0 +1,185 @@
+"""
+Tests for importing items in bulk.
+"""
+import csv
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    ShopList,
+    Item,
+    Category,
+)
+
+
+IMPORT_URL = reverse('shopping:import')
+EXPORT_URL = reverse('shopping:export')
+
+
+def create_user(email):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email, 'pass123')
+
+
+class ImportApiTests(TestCase):
+    """Test the import API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user('user@example.com')
+        self.client.force_authenticate(self.user)
+
+    def post(self, body, content_type='text/csv'):
+        """Post body to the import API and return the response."""
+        return self.client.generic(
+            'POST',
+            IMPORT_URL,
+            body,
+            content_type=content_type,
+        )
+
+    def test_import_csv(self):
+        """Test importing items with categories and stores from CSV."""
+        res = self.post(
+            'name,price,category,store\n'
+            'milk,2.50,dairy,corner\n'
+            'cheese,6,dairy,\n'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'imported': 2, 'errors': []})
+        milk = Item.objects.get(user=self.user, name='Milk')
+        self.assertEqual(milk.price, Decimal('2.50'))
+        self.assertEqual(milk.category.name, 'Dairy')
+        self.assertEqual(milk.store.name, 'Corner')
+        cheese = Item.objects.get(user=self.user, name='Cheese')
+        self.assertEqual(cheese.category, milk.category)
+        self.assertIsNone(cheese.store)
+
+    def test_import_ndjson_updates_existing(self):
+        """Test importing NDJSON updates existing items and list totals."""
+        milk = Item.objects.create(user=self.user, name='Milk', price=2)
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        sl.items.add(milk)
+
+        res = self.post(
+            '{"name": "milk", "price": "3.25", "category": "dairy"}\n'
+            '\n'
+            '{"name": "eggs", "price": 4}\n',
+            content_type='application/x-ndjson',
+        )
+
+        self.assertEqual(res.data['imported'], 2)
+        milk.refresh_from_db()
+        sl.refresh_from_db()
+        self.assertEqual(milk.price, Decimal('3.25'))
+        self.assertEqual(milk.category.name, 'Dairy')
+        self.assertEqual(sl.total, Decimal('3.25'))
+
+    def test_import_reports_row_errors(self):
+        """Test invalid rows are reported while valid ones are imported."""
+        res = self.post(
+            '{"name": "milk", "price": 2}\n'
+            '{"name": "eggs", "price": "cheap"}\n'
+            'not json\n'
+            '{"price": 1}\n',
+            content_type='application/x-ndjson',
+        )
+
+        self.assertEqual(res.data['imported'], 1)
+        self.assertEqual(
+            [error['row'] for error in res.data['errors']],
+            [2, 3, 4],
+        )
+        self.assertIn('price', res.data['errors'][0]['errors'])
+        self.assertIn('name', res.data['errors'][2]['errors'])
+        self.assertEqual(Item.objects.filter(user=self.user).count(), 1)
+
+    def test_import_export(self):
+        """Test an export can be imported for another user."""
+        category = Category.objects.create(user=self.user, name='Dairy')
+        Item.objects.create(
+            user=self.user,
+            name='Milk',
+            price=2,
+            category=category,
+        )
+        ShopList.objects.create(user=self.user, title='Groceries')
+        export = b''.join(
+            self.client.get(EXPORT_URL, {'format': 'csv'}).streaming_content
+        )
+        other = create_user('other@example.com')
+        self.client.force_authenticate(other)
+
+        res = self.post(export)
+
+        self.assertEqual(res.data, {'imported': 1, 'errors': []})
+        self.assertEqual(
+            Item.objects.get(user=other).category.name,
+            'Dairy',
+        )
+
+    def test_import_invalid_encoding(self):
+        """Test a body that is not UTF-8 is rejected without importing."""
+        res = self.post(
+            'name,price\nmilk,2\n'.encode() + b'caf\xe9,3\n',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Item.objects.filter(user=self.user).exists())
+
+    def test_import_malformed_csv(self):
+        """Test CSV the csv module cannot read is rejected."""
+        too_long = 'x' * (csv.field_size_limit() + 1)
+        res = self.post(f'name,price\nmilk,2\n{too_long},3\n')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Item.objects.filter(user=self.user).exists())
+
+    def test_unsupported_media_type(self):
+        """Test imports must be CSV or NDJSON."""
+        res = self.client.post(IMPORT_URL, [], format='json')
+
+        self.assertEqual(
+            res.status_code,
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
+
+class ImportCommandTests(TestCase):
+    """Test the import_items command."""
+
+    def test_import_in_chunks(self):
+        """Test importing a file a few rows at a time."""
+        user = create_user('user@example.com')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as f:
+            f.write('name,price,category,store\n')
+            for i in range(5):
+                f.write(f'item {i},{i},category {i % 2},\n')
+            f.write('bad,,,\n')
+            f.flush()
+            out = StringIO()
+            err = StringIO()
+
+            call_command(
+                'import_items',
+                'user@example.com',
+                f.name,
+                '--chunk-size=2',
+                stdout=out,
+                stderr=err,
+            )
+
+        self.assertIn('Imported 5 rows.', out.getvalue())
+        self.assertIn('Row 6:', err.getvalue())
+        self.assertEqual(Item.objects.filter(user=user).count(), 5)
+        self.assertEqual(Category.objects.filter(user=user).count(), 2)
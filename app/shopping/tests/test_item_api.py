@@ -73,7 +73,73 @@ class PrivateItemAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         items = Item.objects.filter(user=self.user).order_by('-name')
         serializer = ItemSerializer(items, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_items_paginated_by_name(self):
+        """Test items sharing a name prefix are paged without gaps."""
+        for name in ['kale', 'kiwi', 'leek', 'lime', 'lemon']:
+            create_item(user=self.user, name=name)
+
+        res = self.client.get(ITEM_URL, {'page_size': 2})
+        names = [item['name'] for item in res.data['results']]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            names += [item['name'] for item in res.data['results']]
+
+        self.assertEqual(names, ['Lime', 'Lemon', 'Leek', 'Kiwi', 'Kale'])
+
+    def test_filter_items(self):
+        """Test filtering items by tag, price range and name prefix."""
+        dairy = Category.objects.create(user=self.user, name='dairy')
+        milk = create_item(
+            user=self.user,
+            name='milk',
+            price=2,
+            category=dairy,
+        )
+        mint = create_item(user=self.user, name='mint', price=5)
+        create_item(user=self.user, name='melon', price=9)
+        create_item(user=self.user, name='flour', price=2)
+        cases = [
+            ({'category': dairy.id}, [milk]),
+            ({'name': 'mi'}, [mint, milk]),
+            ({'name': 'mi', 'price_max': 3}, [milk]),
+            ({'price_min': '4.5', 'price_max': 6}, [mint]),
+        ]
+
+        for params, expected in cases:
+            with self.subTest(params=params):
+                res = self.client.get(ITEM_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    [item['id'] for item in res.data['results']],
+                    [item.id for item in expected],
+                )
+
+    def test_filter_items_invalid(self):
+        """Test invalid filter values return an error."""
+        for params in ({'category': 'dairy'}, {'store': '²'},
+                       {'price_min': 'cheap'}):
+            with self.subTest(params=params):
+                res = self.client.get(ITEM_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_order_items_by_price(self):
+        """Test ordering items by price, paging in the same order."""
+        for i, price in enumerate([3, 1, 2, 1]):
+            create_item(user=self.user, name=f'item {i}', price=price)
+
+        res = self.client.get(ITEM_URL, {'ordering': 'price', 'page_size': 3})
+        results = res.data['results']
+        res = self.client.get(res.data['next'])
+        results += res.data['results']
+
+        self.assertEqual(
+            [item['name'] for item in results],
+            ['Item 1', 'Item 3', 'Item 2', 'Item 0'],
+        )
 
     def test_create_new_item(self):
         """Test creating an item."""
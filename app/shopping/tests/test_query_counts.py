@@ -0,0 +1,369 @@
+"""
+Test the number of queries issued by the shopping APIs.
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    ShopList,
+    Item,
+    Category,
+    Store,
+)
+
+
+LIST_URL = reverse('shopping:shoplist-list')
+ITEM_URL = reverse('shopping:item-list')
+CATEGORY_URL = reverse('shopping:category-list')
+STORE_URL = reverse('shopping:store-list')
+
+
+def detail_url(basename, obj_id):
+    """Return detail url for an object of the given route basename."""
+    return reverse(f'shopping:{basename}-detail', args=[obj_id])
+
+
+def create_user(**params):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_lists(user, num_lists, num_items):
+    """Create lists each holding items with a category and a store."""
+    category = Category.objects.create(user=user, name='Produce')
+    store = Store.objects.create(user=user, name='Costco')
+    items = [
+        Item.objects.create(
+            user=user,
+            name=f'item {i}',
+            price=1,
+            category=category,
+            store=store,
+        )
+        for i in range(num_items)
+    ]
+    lists = []
+    for i in range(num_lists):
+        sl = ShopList.objects.create(user=user, title=f'list {i}')
+        sl.items.add(*items)
+        lists.append(sl)
+    return lists
+
+
+class QueryCountTests(TestCase):
+    """Test shopping endpoints use a fixed number of queries."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='passs')
+        self.client.force_authenticate(self.user)
+
+    def clear_data(self):
+        """Remove all shopping data."""
+        ShopList.objects.all().delete()
+        Item.objects.all().delete()
+        Category.objects.all().delete()
+        Store.objects.all().delete()
+
+    def assertConstantQueries(self, num, url, sizes=((1, 1), (5, 10))):
+        """Assert GET url costs num queries for each data size."""
+        for num_lists, num_items in sizes:
+            self.clear_data()
+            create_lists(self.user, num_lists, num_items)
+
+            with self.assertNumQueries(num):
+                res = self.client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_shoplists(self):
+        """Test listing shopping lists is independent of list size."""
+        self.assertConstantQueries(3, LIST_URL)
+
+    def test_list_shoplists_deep_page(self):
+        """Test a later page of lists costs the same as the first."""
+        create_lists(self.user, 6, 3)
+        res = self.client.get(LIST_URL, {'page_size': 2})
+        res = self.client.get(res.data['next'])
+
+        with self.assertNumQueries(3):
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_retrieve_shoplist(self):
+        """Test retrieving a shopping list is independent of its size."""
+        for num_items in (1, 20):
+            self.clear_data()
+            sl = create_lists(self.user, 1, num_items)[0]
+
+            with self.assertNumQueries(3):
+                res = self.client.get(detail_url('shoplist', sl.id))
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(res.data['items']), num_items)
+
+    def test_list_shoplists_without_items(self):
+        """Test lists without items skip loading them."""
+        self.assertConstantQueries(2, f'{LIST_URL}?fields=id,title,total')
+
+    def test_list_shoplists_item_ids(self):
+        """Test item ids are loaded in one query without their tags."""
+        self.assertConstantQueries(3, f'{LIST_URL}?expand=')
+
+    def test_create_shoplist(self):
+        """Test creating an empty shopping list."""
+        with self.assertNumQueries(6):
+            res = self.client.post(LIST_URL, {'title': 'stuff'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_create_untitled_shoplist(self):
+        """Test creating an untitled list costs the same as a titled one."""
+        with self.assertNumQueries(6):
+            res = self.client.post(LIST_URL, {})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['title'], f'ShopList{res.data["id"]}')
+
+    def test_create_shoplist_with_items(self):
+        """Test creating a list with nested items is independent of size."""
+        for num_items in (1, 50):
+            payload = {
+                'title': f'list {num_items}',
+                'items': [
+                    {
+                        'name': f'item {num_items} {i}',
+                        'price': 2,
+                        'category': {'name': f'cat {num_items} {i % 3}'},
+                        'store': {'name': f'store {num_items}'},
+                    }
+                    for i in range(num_items)
+                ],
+            }
+
+            with self.assertNumQueries(27):
+                res = self.client.post(LIST_URL, payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(res.data['items']), num_items)
+
+    def test_replace_shoplist_items(self):
+        """Test replacing a list's items is independent of size."""
+        for num_items in (2, 50):
+            self.clear_data()
+            sl = create_lists(self.user, 1, num_items)[0]
+            payload = {
+                'items': [
+                    {'name': f'item {i}', 'price': 3}
+                    for i in range(1, num_items + 1)
+                ],
+            }
+
+            with self.assertNumQueries(32):
+                res = self.client.patch(
+                    detail_url('shoplist', sl.id),
+                    payload,
+                    format='json',
+                )
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.data['total'], 3 * num_items)
+
+    def test_partial_update_shoplist(self):
+        """Test renaming a shopping list."""
+        sl = create_lists(self.user, 1, 10)[0]
+
+        with self.assertNumQueries(8):
+            res = self.client.patch(
+                detail_url('shoplist', sl.id),
+                {'title': 'renamed'},
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_add_item(self):
+        """Test adding items costs the same for one item or many."""
+        sl = create_lists(self.user, 1, 10)[0]
+        url = reverse('shopping:shoplist-add-item', args=[sl.id])
+
+        for num_new in (1, 50):
+            payload = {
+                'items': [
+                    {'name': f'new {num_new} {i}', 'price': 9.50}
+                    for i in range(num_new)
+                ] + [{'name': 'item 0', 'price': 1}],
+            }
+
+            with self.assertNumQueries(15):
+                res = self.client.post(url, payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.data['item_count'], sl.items.count())
+
+    def test_toggle_shoplist(self):
+        """Test toggling a list is a single update plus its change log."""
+        sl = create_lists(self.user, 1, 10)[0]
+
+        with self.assertNumQueries(3):
+            res = self.client.post(
+                reverse('shopping:shoplist-toggle', args=[sl.id]),
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_delete_shoplist(self):
+        """Test deleting a populated shopping list."""
+        sl = create_lists(self.user, 1, 10)[0]
+
+        with self.assertNumQueries(6):
+            res = self.client.delete(detail_url('shoplist', sl.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_list_items(self):
+        """Test listing items is independent of catalogue size."""
+        self.assertConstantQueries(2, ITEM_URL)
+
+    def test_list_items_without_tags(self):
+        """Test items without expanded tags skip joining them."""
+        create_lists(self.user, 1, 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(ITEM_URL, {'expand': ''})
+
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('JOIN', queries[1]['sql'])
+
+    def test_update_item(self):
+        """Test updating an item's price."""
+        item = create_lists(self.user, 1, 1)[0].items.get()
+
+        with self.assertNumQueries(8):
+            res = self.client.patch(
+                detail_url('item', item.id),
+                {'price': 3},
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_bulk_create_items(self):
+        """Test creating items in bulk costs the same for few or many."""
+        for num_new in (2, 50):
+            payload = [
+                {
+                    'name': f'new {num_new} {i}',
+                    'price': 1,
+                    'category': {'name': f'category {num_new} {i % 3}'},
+                    'store': {'name': f'store {num_new}'},
+                }
+                for i in range(num_new)
+            ]
+
+            with self.assertNumQueries(19):
+                res = self.client.post(
+                    reverse('shopping:item-bulk'),
+                    payload,
+                    format='json',
+                )
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_shoplists(self):
+        """Test creating lists in bulk costs the same for few or many."""
+        for num_new in (2, 50):
+            payload = [
+                {'items': [{'name': f'item {num_new} {i}', 'price': 1}]}
+                for i in range(num_new)
+            ]
+
+            with self.assertNumQueries(16):
+                res = self.client.post(
+                    reverse('shopping:shoplist-bulk'),
+                    payload,
+                    format='json',
+                )
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_update_items(self):
+        """Test updating items in bulk costs the same for few or many."""
+        for num_items in (2, 50):
+            self.clear_data()
+            items = create_lists(self.user, 1, num_items)[0].items.all()
+            payload = [
+                {'id': item.id, 'price': 3, 'store': {'name': 'Corner'}}
+                for item in items
+            ]
+
+            with self.assertNumQueries(17):
+                res = self.client.patch(
+                    reverse('shopping:item-bulk'),
+                    payload,
+                    format='json',
+                )
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def assertConstantBulkDelete(self, num, basename, create_objects):
+        """Assert bulk deleting objects costs num queries for any count."""
+        for num_objects in (10, 100):
+            self.clear_data()
+            ids = [obj.id for obj in create_objects(num_objects)]
+
+            with self.assertNumQueries(num):
+                res = self.client.delete(
+                    reverse(f'shopping:{basename}-bulk'),
+                    ids,
+                    format='json',
+                )
+
+            self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_bulk_delete_items(self):
+        """Test deleting items in bulk costs the same for few or many."""
+        self.assertConstantBulkDelete(
+            10,
+            'item',
+            lambda num: create_lists(self.user, 2, num)[0].items.all(),
+        )
+
+    def test_bulk_delete_categories(self):
+        """Test deleting categories in bulk costs the same for few or many."""
+        def create_categories(num):
+            categories = [
+                Category.objects.create(user=self.user, name=f'category {i}')
+                for i in range(num)
+            ]
+            for category in categories:
+                Item.objects.create(
+                    user=self.user,
+                    name=category.name,
+                    price=1,
+                    category=category,
+                )
+            return categories
+
+        self.assertConstantBulkDelete(9, 'category', create_categories)
+
+    def test_bulk_delete_shoplists(self):
+        """Test deleting lists in bulk costs the same for few or many."""
+        self.assertConstantBulkDelete(
+            8,
+            'shoplist',
+            lambda num: create_lists(self.user, num, 2),
+        )
+
+    def test_list_categories(self):
+        """Test listing categories."""
+        self.assertConstantQueries(2, CATEGORY_URL)
+
+    def test_list_stores(self):
+        """Test listing stores."""
+        self.assertConstantQueries(2, STORE_URL)
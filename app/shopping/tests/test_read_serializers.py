@@ -0,0 +1,98 @@
+"""
+Tests that read serializers match the full serializers.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from rest_framework.renderers import JSONRenderer
+
+from core.models import (
+    ShopList,
+    Item,
+    Category,
+    Store,
+)
+from shopping import serializers
+
+
+class ReadSerializerTests(TestCase):
+    """Test read serializers render the same JSON as the full ones."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user('user@example.com')
+        category = Category.objects.create(user=user, name='Dairy')
+        store = Store.objects.create(user=user, name='Corner')
+        items = [
+            Item.objects.create(
+                user=user,
+                name='Milk',
+                price=Decimal('2.5'),
+                category=category,
+                store=store,
+            ),
+            Item.objects.create(user=user, name='Eggs', price=3),
+            Item.objects.create(
+                user=user,
+                name='Tea',
+                price=Decimal('999.99'),
+                store=store,
+            ),
+        ]
+        ShopList.objects.create(user=user, title='Groceries').items.add(
+            *items,
+        )
+        ShopList.objects.create(user=user, title='Empty', active=False)
+
+    def assertSameOutput(self, full, read, queryset):
+        """Assert both serializers render queryset to the same JSON."""
+        for many, instance in ((True, queryset), (False, queryset[0])):
+            with self.subTest(serializer=read.__name__, many=many):
+                self.assertEqual(
+                    JSONRenderer().render(read(instance, many=many).data),
+                    JSONRenderer().render(full(instance, many=many).data),
+                )
+
+    def test_shoplist(self):
+        """Test shopping lists, with and without prefetched items."""
+        for queryset in (
+            ShopList.objects.order_by('id'),
+            ShopList.objects.order_by('id').with_items(),
+        ):
+            self.assertSameOutput(
+                serializers.ShopListSerializer,
+                serializers.ShopListReadSerializer,
+                queryset,
+            )
+
+    def test_item(self):
+        """Test items with and without categories and stores."""
+        self.assertSameOutput(
+            serializers.ItemSerializer,
+            serializers.ItemReadSerializer,
+            Item.objects.order_by('id').select_related('category', 'store'),
+        )
+
+    def test_tags(self):
+        """Test categories and stores."""
+        self.assertSameOutput(
+            serializers.CatSerializer,
+            serializers.CatReadSerializer,
+            Category.objects.all(),
+        )
+        self.assertSameOutput(
+            serializers.StoreSerializer,
+            serializers.StoreReadSerializer,
+            Store.objects.all(),
+        )
+
+    def test_unsaved_values(self):
+        """Test values not read back from the database are formatted."""
+        item = Item(id=1, name='Milk', price=2)
+
+        self.assertEqual(
+            serializers.ItemReadSerializer(item).data,
+            serializers.ItemSerializer(item).data,
+        )
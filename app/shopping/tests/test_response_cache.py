@@ -0,0 +1,241 @@
+"""
+Tests for cached and conditional API responses.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    ShopList,
+    Item,
+    Category,
+)
+
+
+LIST_URL = reverse('shopping:shoplist-list')
+ITEM_URL = reverse('shopping:item-list')
+CAT_URL = reverse('shopping:category-list')
+
+
+def detail_url(list_id):
+    """Return shopping list detail url"""
+    return reverse('shopping:shoplist-detail', args=[list_id])
+
+
+def add_item_url(list_id):
+    """Return url for adding an item to the shopping list."""
+    return reverse('shopping:shoplist-add-item', args=[list_id])
+
+
+def create_user(email):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email, 'pass123')
+
+
+def other_worker_cache():
+    """Return a context giving the code within another worker's cache."""
+    return override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'other-worker',
+        },
+    })
+
+
+class ResponseCacheTests(TestCase):
+    """Test list responses are cached until the user's data changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user('user@example.com')
+        self.client.force_authenticate(self.user)
+
+    def titles(self):
+        """Return the titles listed by the API."""
+        res = self.client.get(LIST_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [sl['title'] for sl in res.data['results']]
+
+    def test_repeat_list_served_from_cache(self):
+        """Test a repeated list request only queries the data version."""
+        ShopList.objects.create(user=self.user, title='Groceries')
+        for url in (LIST_URL, ITEM_URL, CAT_URL):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+
+                with self.assertNumQueries(1):
+                    second = self.client.get(url)
+
+                self.assertEqual(second.data, first.data)
+
+    def test_query_params_cached_separately(self):
+        """Test different query strings are cached independently."""
+        for i in range(3):
+            ShopList.objects.create(user=self.user, title=f'list {i}')
+        self.client.get(LIST_URL)
+
+        res = self.client.get(LIST_URL, {'page_size': 1})
+
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_users_cached_separately(self):
+        """Test a cached response is not served to another user."""
+        ShopList.objects.create(user=self.user, title='Mine')
+        self.titles()
+        other = create_user('other@example.com')
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self.titles(), [])
+
+    def test_api_writes_invalidate(self):
+        """Test writes through the API are visible on the next read."""
+        self.titles()
+        res = self.client.post(LIST_URL, {'title': 'Groceries'})
+        self.assertEqual(self.titles(), ['Groceries'])
+
+        self.client.post(
+            add_item_url(res.data['id']),
+            {'items': [{'name': 'Milk', 'price': 2}]},
+            format='json',
+        )
+
+        res = self.client.get(ITEM_URL)
+        self.assertEqual([i['name'] for i in res.data['results']], ['Milk'])
+
+    def test_model_writes_invalidate(self):
+        """Test writes outside the API, as the frontend makes, invalidate."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        self.titles()
+
+        sl.title = 'Hardware'
+        sl.save()
+        self.assertEqual(self.titles(), ['Hardware'])
+
+        sl.delete()
+        self.assertEqual(self.titles(), [])
+
+    def test_other_worker_writes_invalidate(self):
+        """Test writes made by another worker process are read back."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        self.titles()
+
+        with other_worker_cache():
+            sl.title = 'Hardware'
+            sl.save()
+
+        self.assertEqual(self.titles(), ['Hardware'])
+
+    def test_membership_changes_invalidate(self):
+        """Test adding items to a list updates its cached total."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        item = Item.objects.create(user=self.user, name='Milk', price=2)
+        self.titles()
+
+        sl.items.add(item)
+
+        res = self.client.get(LIST_URL)
+        self.assertEqual(res.data['results'][0]['item_count'], 1)
+
+    def test_shared_tag_changes_invalidate_other_users(self):
+        """Test deleting a shared category invalidates users of it."""
+        owner = create_user('owner@example.com')
+        category = Category.objects.create(
+            user=owner,
+            name='Dairy',
+            private=False,
+        )
+        Item.objects.create(
+            user=self.user,
+            name='Milk',
+            price=2,
+            category=category,
+        )
+        self.client.get(ITEM_URL)
+
+        category.delete()
+
+        res = self.client.get(ITEM_URL)
+        self.assertIsNone(res.data['results'][0]['category'])
+
+
+class ConditionalGetTests(TestCase):
+    """Test ETags and If-None-Match on the API."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user('user@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_poll_not_modified(self):
+        """Test polling with a current ETag returns 304 after one query."""
+        ShopList.objects.create(user=self.user, title='Groceries')
+        res = self.client.get(LIST_URL)
+        etag = res['ETag']
+
+        with self.assertNumQueries(1):
+            res = self.client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        self.assertFalse(res.content)
+
+    def test_changed_data_new_etag(self):
+        """Test a write changes the ETag and the full response is sent."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        etag = self.client.get(LIST_URL)['ETag']
+
+        sl.title = 'Hardware'
+        sl.save()
+        res = self.client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(res.data['results'][0]['title'], 'Hardware')
+
+    def test_other_worker_write_new_etag(self):
+        """Test a write made by another worker process changes the ETag."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        etag = self.client.get(LIST_URL)['ETag']
+
+        with other_worker_cache():
+            sl.title = 'Hardware'
+            sl.save()
+        res = self.client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['title'], 'Hardware')
+
+    def test_etag_differs_per_resource(self):
+        """Test ETags are not shared between urls or users."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        etags = {
+            self.client.get(LIST_URL)['ETag'],
+            self.client.get(LIST_URL, {'page_size': 1})['ETag'],
+            self.client.get(detail_url(sl.id))['ETag'],
+        }
+        self.client.force_authenticate(create_user('other@example.com'))
+        etags.add(self.client.get(LIST_URL)['ETag'])
+
+        self.assertEqual(len(etags), 4)
+
+    def test_detail_not_modified(self):
+        """Test a shopping list detail honours If-None-Match."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        etag = self.client.get(detail_url(sl.id))['ETag']
+
+        res = self.client.get(detail_url(sl.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_errors_not_tagged(self):
+        """Test error responses carry no ETag."""
+        res = self.client.get(detail_url(0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', res)
@@ -1,6 +1,8 @@
 """
 Test shopping list APIs.
 """
+from decimal import Decimal
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -11,6 +13,7 @@ from rest_framework.test import APIClient
 from core.models import (
     ShopList,
     Item,
+    Category,
 )
 
 from shopping.serializers import ShopListSerializer
@@ -29,6 +32,11 @@ def add_item_url(list_id):
     return reverse('shopping:shoplist-add-item', args=[list_id])
 
 
+def toggle_url(list_id):
+    """Return url for toggling whether the shopping list is active."""
+    return reverse('shopping:shoplist-toggle', args=[list_id])
+
+
 def create_list(user, **params):
     """Create and return a list."""
     defaults = {
@@ -78,7 +86,23 @@ class PrivateAPITests(TestCase):
         slist = ShopList.objects.all().order_by('-id')
         serializer = ShopListSerializer(slist, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_shoplists_paginated(self):
+        """Test shopping lists are returned a page at a time."""
+        lists = [create_list(user=self.user, title=str(i)) for i in range(5)]
+
+        res = self.client.get(LIST_URL, {'page_size': 2})
+        pages = [res.data['results']]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            pages.append(res.data['results'])
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(
+            [sl['id'] for page in pages for sl in page],
+            [sl.id for sl in reversed(lists)],
+        )
 
     def test_create_shoplist(self):
         """Test creating a shopping list."""
@@ -128,6 +152,102 @@ class PrivateAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data['total'], item1.price + item2.price)
 
+    def test_filter_by_total(self):
+        """Test filtering shopping lists by total range."""
+        cheap = create_list(user=self.user, title='cheap')
+        dear = create_list(user=self.user, title='dear')
+        empty = create_list(user=self.user, title='empty')
+        cheap.items.add(
+            Item.objects.create(user=self.user, name='gum', price=1.25),
+        )
+        dear.items.add(
+            Item.objects.create(user=self.user, name='steak', price=30),
+        )
+
+        res = self.client.get(LIST_URL, {'total_min': 1, 'total_max': 10})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([sl['id'] for sl in res.data['results']], [cheap.id])
+
+        res = self.client.get(LIST_URL, {'total_max': '1.25'})
+
+        ids = {sl['id'] for sl in res.data['results']}
+        self.assertEqual(ids, {cheap.id, empty.id})
+
+    def test_filter_by_active(self):
+        """Test filtering shopping lists by whether they are active."""
+        active = create_list(user=self.user, title='active')
+        done = create_list(user=self.user, title='done', active=False)
+
+        for value, expected in (('true', active), ('false', done)):
+            res = self.client.get(LIST_URL, {'active': value})
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [sl['id'] for sl in res.data['results']],
+                [expected.id],
+            )
+
+        res = self.client.get(LIST_URL, {'active': 'maybe'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_by_invalid_total(self):
+        """Test filtering by a non-numeric total returns an error."""
+        res = self.client.get(LIST_URL, {'total_min': 'lots'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_order_by_total(self):
+        """Test ordering shopping lists by total."""
+        sl1 = create_list(user=self.user, title='one')
+        sl2 = create_list(user=self.user, title='two')
+        sl1.items.add(
+            Item.objects.create(user=self.user, name='cake', price=12),
+        )
+        sl2.items.add(
+            Item.objects.create(user=self.user, name='pie', price=8),
+            Item.objects.create(user=self.user, name='tart', price=5),
+        )
+
+        res = self.client.get(LIST_URL, {'ordering': '-total'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        results = res.data['results']
+        self.assertEqual([sl['id'] for sl in results], [sl2.id, sl1.id])
+        self.assertEqual(results[0]['total'], Decimal('13.00'))
+
+    def test_order_by_default_title(self):
+        """Test untitled lists are ordered and paged by their title."""
+        lists = [create_list(user=self.user, title='') for _ in range(5)]
+        lists.append(create_list(user=self.user, title='Aardvark'))
+        expected = sorted(lists, key=lambda sl: (sl.title, sl.id))
+
+        res = self.client.get(LIST_URL, {'ordering': 'title', 'page_size': 2})
+        results = res.data['results']
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            results += res.data['results']
+
+        self.assertEqual(
+            [sl['title'] for sl in results],
+            [sl.title for sl in expected],
+        )
+
+    def test_partial_update_keeps_default_title(self):
+        """Test updating an untitled list does not store its title."""
+        sl = create_list(user=self.user, title='')
+
+        res = self.client.patch(detail_url(sl.id), {'active': False})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['title'], f'ShopList{sl.id}')
+        self.assertEqual(
+            ShopList.objects.filter(id=sl.id).values_list('title', 'active')
+                            .get(),
+            ('', False),
+        )
+
     def test_partial_update(self):
         """Test updating part of the shopping list."""
         sl = create_list(user=self.user, title='groceries')
@@ -142,6 +262,42 @@ class PrivateAPITests(TestCase):
         shoplist = ShopList.objects.get(user=self.user, title='groceries')
         self.assertEqual(shoplist.items.count(), 1)
 
+    def test_replace_items(self):
+        """Test replacing items keeps shared ones and updates them."""
+        sl = create_list(user=self.user, title='groceries')
+        produce = Category.objects.create(user=self.user, name='Produce')
+        apple = Item.objects.create(
+            user=self.user,
+            name='apple',
+            price=.75,
+            category=produce,
+        )
+        pear = Item.objects.create(user=self.user, name='pear', price=1)
+        sl.items.add(apple, pear)
+        other = create_list(user=self.user, title='other')
+        other.items.add(apple)
+
+        payload = {'items': [
+            {'name': 'apple', 'price': 1.5, 'category': {'name': 'fruit'}},
+            {'name': 'fish', 'price': 9.50},
+        ]}
+        url = detail_url(sl.id)
+        res = self.client.patch(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['total'], Decimal('11.00'))
+        self.assertEqual(
+            set(sl.items.values_list('name', flat=True)),
+            {'Apple', 'Fish'},
+        )
+        apple.refresh_from_db()
+        self.assertEqual(apple.price, Decimal('1.50'))
+        self.assertEqual(apple.category.name, 'Fruit')
+        self.assertTrue(Category.objects.filter(id=produce.id).exists())
+        self.assertTrue(Item.objects.filter(id=pear.id).exists())
+        other.refresh_from_db()
+        self.assertEqual(other.total, Decimal('1.50'))
+
     def test_add_item_to_existing_list(self):
         """Test adding an item to a shopping list."""
         sl = create_list(user=self.user)
@@ -161,3 +317,87 @@ class PrivateAPITests(TestCase):
                 user=self.user,
             ).exists()
             self.assertTrue(exists)
+
+    def test_add_items_reuses_existing(self):
+        """Test adding items reuses the user's items and tags by name."""
+        sl = create_list(user=self.user)
+        pasta = Item.objects.create(user=self.user, name='pasta', price=1.25)
+        user2 = create_user(email='user2@example.com', password='passs')
+        Item.objects.create(user=user2, name='sauce', price=3)
+
+        payload = {'items': [
+            {'name': 'PASTA', 'price': 1.25},
+            {'name': 'sauce', 'price': 4, 'category': {'name': 'pantry'}},
+            {'name': 'garlic', 'price': .5, 'category': {'name': 'Pantry'}},
+        ]}
+        url = add_item_url(sl.id)
+        res = self.client.post(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        sl.refresh_from_db()
+        self.assertEqual(sl.item_count, 3)
+        self.assertEqual(sl.total, Decimal('5.75'))
+        self.assertTrue(sl.items.filter(id=pasta.id).exists())
+        self.assertEqual(Item.objects.filter(user=self.user).count(), 3)
+        sauce = Item.objects.get(user=self.user, name='Sauce')
+        garlic = Item.objects.get(user=self.user, name='Garlic')
+        self.assertEqual(sauce.category, garlic.category)
+        self.assertEqual(sauce.category.name, 'Pantry')
+
+    def test_add_existing_item_updates_price(self):
+        """Test adding an existing item with a new price updates it."""
+        sl = create_list(user=self.user)
+        other = create_list(user=self.user, title='other')
+        pasta = Item.objects.create(user=self.user, name='pasta', price=1.25)
+        other.items.add(pasta)
+
+        payload = {'items': [{'name': 'pasta', 'price': 2}]}
+        res = self.client.post(add_item_url(sl.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['items'][0]['price'], '2.00')
+        pasta.refresh_from_db()
+        self.assertEqual(pasta.price, Decimal('2.00'))
+        sl.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(sl.total, Decimal('2.00'))
+        self.assertEqual(other.total, Decimal('2.00'))
+
+    def test_add_invalid_items(self):
+        """Test adding invalid items changes nothing."""
+        sl = create_list(user=self.user)
+
+        payload = {'items': [{'name': 'tea', 'price': 2}, {'name': 'cake'}]}
+        url = add_item_url(sl.id)
+        res = self.client.post(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Item.objects.filter(user=self.user).exists())
+
+    def test_toggle(self):
+        """Test toggling a list marks it complete and back."""
+        sl = create_list(user=self.user)
+
+        res = self.client.post(toggle_url(sl.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'id': sl.id, 'active': False})
+        res = self.client.post(toggle_url(sl.id))
+        self.assertEqual(res.data, {'id': sl.id, 'active': True})
+
+    def test_toggle_other_users_list(self):
+        """Test toggling another user's list is not found."""
+        other = create_user(email='other@example.com', password='passs')
+        sl = create_list(user=other)
+
+        res = self.client.post(toggle_url(sl.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        sl.refresh_from_db()
+        self.assertTrue(sl.active)
+
+    def test_toggle_invalid_id(self):
+        """Test toggling a list id that is not an ASCII integer."""
+        res = self.client.post(f'{LIST_URL}%C2%B2/toggle/')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
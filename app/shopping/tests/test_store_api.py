@@ -57,7 +57,7 @@ class PrivateStoreAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         stores = Store.objects.filter(user=self.user).order_by('-name')
         serializer = StoreSerializer(stores, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_private_is_true(self):
         """Test private must be set to True."""
@@ -0,0 +1,168 @@
+"""
+Tests for the sync API.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    ShopList,
+    Item,
+    Category,
+    Store,
+)
+from shopping.views import SyncView
+
+
+SYNC_URL = reverse('shopping:sync')
+
+
+def create_user(email):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email, 'pass123')
+
+
+class PublicSyncApiTests(TestCase):
+    """Test unauthenticated sync API access."""
+
+    def test_authentication_required(self):
+        """Test authentication is required."""
+        res = APIClient().get(SYNC_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateSyncApiTests(TestCase):
+    """Test syncing changes since a cursor."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user('user@example.com')
+        self.client.force_authenticate(self.user)
+
+    def sync(self, cursor=None):
+        """Return sync data since cursor."""
+        params = {} if cursor is None else {'cursor': cursor}
+        res = self.client.get(SYNC_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def ids(self, data, key):
+        """Return ids of the objects under key in sync data."""
+        return [obj['id'] for obj in data[key]]
+
+    def test_initial_sync_returns_everything(self):
+        """Test syncing from the start returns all of the user's objects."""
+        category = Category.objects.create(user=self.user, name='Dairy')
+        store = Store.objects.create(user=self.user, name='Corner')
+        item = Item.objects.create(
+            user=self.user,
+            name='Milk',
+            price=2,
+            category=category,
+            store=store,
+        )
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        sl.items.add(item)
+        other = create_user('other@example.com')
+        ShopList.objects.create(user=other, title='Not mine')
+
+        data = self.sync()
+
+        self.assertEqual(self.ids(data, 'lists'), [sl.id])
+        self.assertEqual(self.ids(data, 'items'), [item.id])
+        self.assertEqual(self.ids(data, 'categories'), [category.id])
+        self.assertEqual(self.ids(data, 'stores'), [store.id])
+        self.assertEqual(data['lists'][0]['items'][0]['name'], 'Milk')
+        self.assertFalse(data['more'])
+
+    def test_sync_returns_only_changes(self):
+        """Test a later sync returns only objects changed since."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        item = Item.objects.create(user=self.user, name='Milk', price=2)
+        Item.objects.create(user=self.user, name='Eggs', price=3)
+        sl.items.add(item)
+        cursor = self.sync()['cursor']
+
+        data = self.sync(cursor)
+        self.assertEqual(self.ids(data, 'items'), [])
+        self.assertEqual(data['cursor'], cursor)
+
+        item.price = 4
+        item.save()
+        data = self.sync(cursor)
+
+        self.assertEqual(self.ids(data, 'items'), [item.id])
+        self.assertEqual(self.ids(data, 'lists'), [sl.id])
+        self.assertEqual(data['lists'][0]['total'], 4)
+        self.assertGreater(data['cursor'], cursor)
+
+    def test_sync_returns_deletions(self):
+        """Test deleted objects are returned as tombstones."""
+        sl = ShopList.objects.create(user=self.user, title='Groceries')
+        item = Item.objects.create(user=self.user, name='Milk', price=2)
+        cursor = self.sync()['cursor']
+        created = Store.objects.create(user=self.user, name='Corner')
+        sl_id, item_id, created_id = sl.id, item.id, created.id
+
+        sl.delete()
+        item.delete()
+        created.delete()
+        data = self.sync(cursor)
+
+        self.assertEqual(data['deleted']['lists'], [sl_id])
+        self.assertEqual(data['deleted']['items'], [item_id])
+        self.assertEqual(data['deleted']['stores'], [created_id])
+        self.assertEqual(self.ids(data, 'lists'), [])
+
+    def test_shared_tag_change_syncs_items(self):
+        """Test deleting a shared category syncs other users' items."""
+        owner = create_user('owner@example.com')
+        category = Category.objects.create(
+            user=owner,
+            name='Dairy',
+            private=False,
+        )
+        item = Item.objects.create(
+            user=self.user,
+            name='Milk',
+            price=2,
+            category=category,
+        )
+        cursor = self.sync()['cursor']
+
+        category.delete()
+        data = self.sync(cursor)
+
+        self.assertEqual(self.ids(data, 'items'), [item.id])
+        self.assertIsNone(data['items'][0]['category'])
+        self.assertEqual(data['deleted']['categories'], [])
+
+    @mock.patch.object(SyncView, 'page_size', 2)
+    def test_sync_in_pages(self):
+        """Test large syncs are returned in pages following the cursor."""
+        for i in range(3):
+            Store.objects.create(user=self.user, name=f'store {i}')
+
+        first = self.sync()
+        second = self.sync(first['cursor'])
+
+        self.assertTrue(first['more'])
+        self.assertEqual(len(first['stores']), 2)
+        self.assertEqual(len(second['stores']), 1)
+        self.assertFalse(second['more'])
+
+    def test_invalid_cursor(self):
+        """Test an invalid cursor returns an error."""
+        for cursor in ('-1', '²'):
+            with self.subTest(cursor=cursor):
+                res = self.client.get(SYNC_URL, {'cursor': cursor})
+
+                self.assertEqual(
+                    res.status_code, status.HTTP_400_BAD_REQUEST,
+                )
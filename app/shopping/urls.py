@@ -20,5 +20,13 @@ router.register('store', views.StoreViewSet)
 app_name = 'shopping'
 
 urlpatterns = [
+    path('sync/', views.SyncView.as_view(), name='sync'),
+    path(
+        'autocomplete/',
+        views.AutocompleteView.as_view(),
+        name='autocomplete',
+    ),
+    path('export/', views.ExportView.as_view(), name='export'),
+    path('import/', views.ImportView.as_view(), name='import'),
     path('', include(router.urls))
 ]
@@ -1,90 +1,236 @@
 """
 Shopping list API views.
 """
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.http import StreamingHttpResponse
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter,
+)
 from rest_framework import (
+    generics,
     viewsets,
     mixins,
-    status
+    renderers as drf_renderers,
+    status,
+    filters as drf_filters,
 )
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
 from core.models import (
+    Change,
     ShopList,
     Item,
     Category,
     Store,
+    shoplist_title,
+)
+
+from shopping import (
+    serializers,
+    filters,
+    pagination,
+    parsers,
+    renderers,
 )
+from shopping.exports import export_records
+from shopping.imports import import_items
+from shopping.mixins import (
+    BulkModelMixin,
+    CachedListMixin,
+    FieldSelectionMixin,
+    ReadSerializerMixin,
+)
+from user.authentication import CachedTokenAuthentication
+
 
-from shopping import serializers
+FIELD_SELECTION_SCHEMA = extend_schema(parameters=[
+    OpenApiParameter(
+        'fields',
+        OpenApiTypes.STR,
+        description='Comma separated fields to return, all by default.',
+    ),
+    OpenApiParameter(
+        'expand',
+        OpenApiTypes.STR,
+        description='Comma separated relations to return in full, such '
+                    'as items.category; others are returned as ids. '
+                    'All relations are expanded by default.',
+    ),
+])
 
 
-class ShopListViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=FIELD_SELECTION_SCHEMA,
+    retrieve=FIELD_SELECTION_SCHEMA,
+)
+class ShopListViewSet(CachedListMixin,
+                      BulkModelMixin,
+                      FieldSelectionMixin,
+                      viewsets.ModelViewSet):
     """Views for managing shopping list APIs."""
     serializer_class = serializers.ShopListSerializer
+    read_serializer_class = serializers.ShopListReadSerializer
     queryset = ShopList.objects.all()
-    authentication_classes = [TokenAuthentication]
+    lookup_value_regex = '[0-9]+'
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = pagination.IdCursorPagination
+    filter_backends = [
+        filters.ActiveFilter,
+        filters.TotalRangeFilter,
+        filters.ExpressionOrderingFilter,
+    ]
+    ordering_fields = ['id', 'title', 'total']
+    ordering_expressions = {'title': shoplist_title}
+    ordering = ['-id']
 
     def get_queryset(self):
         """Retrieve shopping list."""
         user = self.request.user
-        return self.queryset.filter(user=user).order_by('-id')
+        queryset = self.queryset.filter(user=user).order_by('-id')
+        if self.action in ('add_item', 'bulk_destroy') \
+                or not self.is_shown('items'):
+            return queryset
+        if not self.is_expanded('items'):
+            return queryset.prefetch_related(
+                Prefetch('items', queryset=Item.objects.only('id')),
+            )
+        return queryset.with_items(related=tuple(
+            name for name in ('category', 'store')
+            if self.is_expanded(f'items.{name}')
+        ))
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a shopping list, reusing a cached response if possible."""
+        return self.cached_response(
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
 
     def perform_create(self, serializer):
         """Create a new shopping list."""
         serializer.save(user=self.request.user)
 
+    def perform_bulk_create(self, serializer):
+        """Create new shopping lists."""
+        serializer.save(user=self.request.user)
+
+    @action(methods=['post'], detail=False, url_path='bulk', url_name='bulk')
+    def bulk_create(self, request):
+        """Create many lists; lists are only created or deleted in bulk."""
+        return super().bulk_create(request)
+
+    bulk_destroy = bulk_create.mapping.delete(BulkModelMixin.bulk_destroy)
+
     @action(methods=['POST'], detail=True, url_path='add-item')
     def add_item(self, request, pk=None):
+        """Add items to a shopping list, creating any that are new.
+
+        Existing items take the price, category and store sent for them,
+        as when items are given with a list.
+        """
         sl = self.get_object()
-        auth_user = self.request.user
+        items = serializers.ItemSerializer(
+            data=request.data.get('items'),
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        items.is_valid(raise_exception=True)
 
-        for item in request.data['items']:
-            item_obj, created = Item.objects.get_or_create(
-                user=auth_user,
-                **item,
-            )
-            sl.items.add(item_obj)
+        with transaction.atomic():
+            sl.items.add(*items.get_or_create_items(
+                items.validated_data,
+                update=True,
+            ))
 
-        sl.save()
-        serializer = self.serializer_class(sl)
+        serializer = self.read_serializer_class(sl)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        request=None,
+        responses=serializers.ShopListToggleSerializer,
+    )
+    @action(methods=['POST'], detail=True)
+    def toggle(self, request, pk=None):
+        """Mark a shopping list complete or incomplete, flipping active."""
+        pk = int(pk)
+        active = ShopList.objects.toggle_active(request.user, pk)
+        if active is None:
+            raise NotFound()
+        serializer = serializers.ShopListToggleSerializer(
+            {'id': pk, 'active': active},
+        )
+        return Response(serializer.data)
+
 
-class ItemViewSet(mixins.CreateModelMixin,
+@extend_schema_view(list=FIELD_SELECTION_SCHEMA)
+class ItemViewSet(CachedListMixin,
+                  BulkModelMixin,
+                  FieldSelectionMixin,
+                  mixins.CreateModelMixin,
                   mixins.DestroyModelMixin,
                   mixins.UpdateModelMixin,
                   mixins.ListModelMixin,
                   viewsets.GenericViewSet):
     """Views for managing item APIs."""
     serializer_class = serializers.ItemSerializer
+    read_serializer_class = serializers.ItemReadSerializer
     queryset = Item.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = pagination.NameCursorPagination
+    filter_backends = [
+        filters.TagFilter,
+        filters.PriceRangeFilter,
+        filters.NamePrefixFilter,
+        drf_filters.OrderingFilter,
+    ]
+    ordering_fields = ['id', 'name', 'price']
+    ordering = ['-name']
 
     def get_queryset(self):
         """Retrieve list of items."""
         user = self.request.user
-        return self.queryset.filter(user=user).order_by('-name')
+        queryset = self.queryset.filter(user=user).order_by('-name')
+        related = [
+            name for name in ('category', 'store') if self.is_expanded(name)
+        ]
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
 
     def perform_create(self, serializer):
         """Create a new item."""
         serializer.save(user=self.request.user)
 
 
-class CatViewSet(mixins.CreateModelMixin,
+class CatViewSet(CachedListMixin,
+                 BulkModelMixin,
+                 ReadSerializerMixin,
+                 mixins.CreateModelMixin,
                  mixins.DestroyModelMixin,
                  mixins.UpdateModelMixin,
                  mixins.ListModelMixin,
                  viewsets.GenericViewSet):
     """Views for managing category APIs."""
     serializer_class = serializers.CatSerializer
+    read_serializer_class = serializers.CatReadSerializer
     queryset = Category.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = pagination.NameCursorPagination
 
     def get_queryset(self):
         """Retrieve list of categories."""
@@ -96,16 +242,21 @@ class CatViewSet(mixins.CreateModelMixin,
         serializer.save(user=self.request.user, private=True)
 
 
-class StoreViewSet(mixins.CreateModelMixin,
+class StoreViewSet(CachedListMixin,
+                   BulkModelMixin,
+                   ReadSerializerMixin,
+                   mixins.CreateModelMixin,
                    mixins.DestroyModelMixin,
                    mixins.UpdateModelMixin,
                    mixins.ListModelMixin,
                    viewsets.GenericViewSet):
     """Views for managing store APIs."""
     serializer_class = serializers.StoreSerializer
+    read_serializer_class = serializers.StoreReadSerializer
     queryset = Store.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = pagination.NameCursorPagination
 
     def get_queryset(self):
         """Retrieve list of stores."""
@@ -115,3 +266,146 @@ class StoreViewSet(mixins.CreateModelMixin,
     def perform_create(self, serializer):
         """Create a new store."""
         serializer.save(user=self.request.user, private=True)
+
+
+class SyncView(generics.GenericAPIView):
+    """View for fetching changes since a sync cursor."""
+    serializer_class = serializers.SyncSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    page_size = 1000
+    querysets = {
+        'lists': ShopList.objects.with_items(),
+        'items': Item.objects.select_related('category', 'store'),
+        'categories': Category.objects.all(),
+        'stores': Store.objects.all(),
+    }
+
+    @extend_schema(parameters=[
+        OpenApiParameter(
+            'cursor',
+            OpenApiTypes.INT,
+            description='Cursor returned by the previous sync, 0 at first.',
+        ),
+    ])
+    def get(self, request):
+        """Return objects changed or deleted since the cursor."""
+        user = request.user
+        cursor = filters.int_param(request, 'cursor', 0)
+        changes = Change.objects.filter(user=user, id__gt=cursor) \
+                                .order_by('id') \
+                                .values_list('id', 'kind', 'object_id')
+        changes = list(changes[:self.page_size])
+        changed = defaultdict(set)
+        for _, kind, object_id in changes:
+            changed[kind].add(object_id)
+
+        data = {
+            'cursor': changes[-1][0] if changes else cursor,
+            'more': len(changes) == self.page_size,
+            'deleted': {},
+        }
+        for key, queryset in self.querysets.items():
+            ids = changed[queryset.model._meta.model_name]
+            objs = list(
+                queryset.filter(user=user, id__in=ids).order_by('id')
+            ) if ids else []
+            data[key] = objs
+            data['deleted'][key] = sorted(ids - {obj.id for obj in objs})
+
+        serializer = self.get_serializer(data)
+        return Response(serializer.data)
+
+
+class AutocompleteView(generics.GenericAPIView):
+    """View for completing item, category and store names."""
+    serializer_class = serializers.AutocompleteSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 50
+
+    @extend_schema(parameters=[
+        OpenApiParameter(
+            'q',
+            OpenApiTypes.STR,
+            description='Words, or starts of words, in the names to find.',
+        ),
+        OpenApiParameter(
+            'limit',
+            OpenApiTypes.INT,
+            description='Matches to return of each kind, 10 by default.',
+        ),
+    ])
+    def get(self, request):
+        """Return the best matching items, categories and stores."""
+        user = request.user
+        text = request.query_params.get('q', '')
+        limit = min(
+            filters.int_param(request, 'limit', self.default_limit),
+            self.max_limit,
+        )
+        tags = Q(user=user) | Q(private=False)
+        data = {
+            'items': Item.objects.filter(user=user)
+                                 .select_related('category', 'store')
+                                 .search(text)[:limit],
+            'categories': Category.objects.filter(tags).search(text)[:limit],
+            'stores': Store.objects.filter(tags).search(text)[:limit],
+        }
+        serializer = self.get_serializer(data)
+        return Response(serializer.data)
+
+
+class ExportView(generics.GenericAPIView):
+    """View for streaming all of a user's shopping data."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [renderers.NDJSONRenderer, renderers.CSVRenderer]
+
+    @extend_schema(responses={
+        (200, renderers.NDJSONRenderer.media_type): OpenApiTypes.STR,
+        (200, renderers.CSVRenderer.media_type): OpenApiTypes.STR,
+    })
+    def get(self, request):
+        """Stream categories, stores, items and lists as NDJSON or CSV."""
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(export_records(request.user)),
+            content_type=renderer.media_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="shopping.{renderer.format}"'
+        )
+        return response
+
+    def handle_exception(self, exc):
+        """Report errors as JSON rather than as export records."""
+        response = super().handle_exception(exc)
+        self.request.accepted_renderer = drf_renderers.JSONRenderer()
+        self.request.accepted_media_type = 'application/json'
+        return response
+
+
+class ImportView(generics.GenericAPIView):
+    """View for creating or updating items in bulk from CSV or NDJSON."""
+    serializer_class = serializers.ImportResultSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = [parsers.CSVParser, parsers.NDJSONParser]
+
+    @extend_schema(request={
+        parsers.CSVParser.media_type: OpenApiTypes.STR,
+        parsers.NDJSONParser.media_type: OpenApiTypes.STR,
+    })
+    def post(self, request):
+        """Import rows of name, price, category and store."""
+        imported, errors = import_items(
+            request.data,
+            self.get_serializer_context(),
+        )
+        serializer = self.get_serializer({
+            'imported': imported,
+            'errors': errors,
+        })
+        return Response(serializer.data, status=status.HTTP_200_OK)
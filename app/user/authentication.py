@@ -0,0 +1,127 @@
+"""
+Authentication classes for the APIs.
+"""
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+
+
+# Cache backends whose entries other processes cannot see.
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+class LRUCache:
+    """Process-local least recently used cache with expiring entries."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """Return the value stored for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store value for key, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+local_tokens = LRUCache(
+    settings.TOKEN_CACHE_LOCAL_SIZE,
+    settings.TOKEN_CACHE_LOCAL_TTL,
+)
+
+
+def shared_cache_key(key):
+    """Return the shared cache key for a token without exposing it."""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'auth-token:{digest}'
+
+
+def shared_cache_enabled():
+    """Return whether the default cache is shared between processes."""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def _delete_shared(key):
+    cache.delete(shared_cache_key(key))
+
+
+def invalidate_token(key):
+    """Forget a cached token in this process and the shared cache.
+
+    The shared entry is deleted again once the transaction commits, so a
+    lookup by another process before the commit does not restore it.
+    """
+    local_tokens.delete(key)
+    if shared_cache_enabled():
+        _delete_shared(key)
+        transaction.on_commit(lambda: _delete_shared(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that caches token lookups.
+
+    Tokens are looked up in a process-local LRU first, then the shared
+    cache, and only then the database. The shared tier is skipped when
+    the default cache is process-local, as with the LocMem default.
+
+    Rotated or deleted tokens are removed from this process and the
+    shared cache by user.signals. Other processes accept them until
+    their local entry expires, at most TOKEN_CACHE_LOCAL_TTL seconds.
+
+    Each request gets its own copy of the cached token and user, so
+    changes a view makes to request.user never reach other requests.
+    """
+
+    def authenticate_credentials(self, key):
+        token = local_tokens.get(key)
+        if token is None:
+            shared = shared_cache_enabled()
+            token = cache.get(shared_cache_key(key)) if shared else None
+            if token is None:
+                user, token = super().authenticate_credentials(key)
+                if shared:
+                    cache.set(
+                        shared_cache_key(key),
+                        token,
+                        settings.TOKEN_CACHE_SHARED_TTL,
+                    )
+            local_tokens.set(key, token)
+        token = copy.deepcopy(token)
+        return (token.user, token)
@@ -0,0 +1,152 @@
+"""
+Tests for cached token authentication.
+"""
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user.authentication import (
+    CachedTokenAuthentication,
+    LRUCache,
+    local_tokens,
+    shared_cache_key,
+)
+
+
+ME_URL = reverse('user:me')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test API requests authenticated with cached tokens."""
+
+    def setUp(self):
+        local_tokens.clear()
+        cache.clear()
+        self.user = create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_token_skips_database(self):
+        """Test repeated requests authenticate without queries."""
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_cached_user_not_shared_between_requests(self):
+        """Test changes to one request's user do not reach the next."""
+        auth = CachedTokenAuthentication()
+        user, _ = auth.authenticate_credentials(self.token.key)
+        user.name = 'Unsaved Name'
+
+        with self.assertNumQueries(0):
+            other, _ = auth.authenticate_credentials(self.token.key)
+
+        self.assertIsNot(other, user)
+        self.assertEqual(other.name, 'Test Name')
+
+    def test_shared_cache_used_by_other_processes(self):
+        """Test a token cached by another process skips the database."""
+        with tempfile.TemporaryDirectory() as location:
+            with override_settings(CACHES={
+                'default': {
+                    'BACKEND':
+                        'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': location,
+                },
+            }):
+                self.client.get(ME_URL)
+                local_tokens.clear()
+
+                with self.assertNumQueries(0):
+                    res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_process_local_cache_not_shared(self):
+        """Test a process-local default cache is not used as shared tier."""
+        self.client.get(ME_URL)
+        local_tokens.clear()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(shared_cache_key(self.token.key)))
+
+    def test_deleted_token_rejected(self):
+        """Test a deleted token stops authenticating."""
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_rejected(self):
+        """Test deactivating a user stops their token authenticating."""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token_rejected(self):
+        """Test an unknown token is rejected."""
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class LRUCacheTests(TestCase):
+    """Test the process-local token cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is evicted when full."""
+        lru = LRUCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('c'), 3)
+
+    @mock.patch('user.authentication.time.monotonic')
+    def test_entries_expire(self, monotonic):
+        """Test entries are dropped once their ttl has passed."""
+        monotonic.return_value = 100
+        lru = LRUCache(maxsize=2, ttl=10)
+        lru.set('a', 1)
+
+        monotonic.return_value = 109
+        self.assertEqual(lru.get('a'), 1)
+        monotonic.return_value = 110
+        self.assertIsNone(lru.get('a'))